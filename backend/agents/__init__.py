@@ -7,6 +7,8 @@ from agents.base import (
     AgentConfig,
     AgentRole,
     LLMProvider,
+    ProjectContext,
+    TaskSpec,
 )
 from agents.development import (
     ArchitectAgent,
@@ -33,6 +35,8 @@ __all__ = [
     "AgentConfig",
     "AgentRole",
     "LLMProvider",
+    "ProjectContext",
+    "TaskSpec",
     # Development Agents
     "ArchitectAgent",
     "BackendDeveloperAgent",
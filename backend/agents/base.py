@@ -2,20 +2,36 @@
 Base Agent Configuration
 Provides foundational classes and utilities for all AI agents.
 """
+import asyncio
+import contextvars
+import functools
+import logging
+import re
+import threading
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from textwrap import dedent
+from typing import Any, Callable, Dict, List, Optional, Tuple
 from dataclasses import dataclass, field
 from enum import Enum
+import orjson
 import structlog
 
-from crewai import Agent, Task, Crew
-from langchain_openai import ChatOpenAI
-from langchain_anthropic import ChatAnthropic
+from crewai import Agent, Task, Crew, LLM
 
+from agents.llm_cache import CachingLLM
+from agents.rate_limit import ThrottledLLM
 from core.config import settings
 
 logger = structlog.get_logger(__name__)
 
+# Answer markers in a batched response, e.g. "A[2]: ...", also when the
+# model decorates them with markdown ("**A[2]:**", "### A[2]:", "`A[2]`:")
+_ANSWER_MARKER = re.compile(
+    r"^[ \t>#*_`]*A\[(\d+)\][*_`]*[ \t]*:[*_`]*[ \t]*",
+    re.MULTILINE
+)
+
 
 class AgentRole(str, Enum):
     """Enumeration of available agent roles."""
@@ -31,19 +47,135 @@ class AgentRole(str, Enum):
     TECHNICAL_WRITER = "technical_writer"
 
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class AgentConfig:
     """Configuration for an AI agent."""
     role: AgentRole
     goal: str
     backstory: str
     tools: List[Any] = field(default_factory=list)
-    verbose: bool = True
+    verbose: bool = field(default_factory=lambda: settings.AGENT_VERBOSE)
     allow_delegation: bool = False
     max_iterations: int = 10
     memory: bool = True
 
 
+# Guards first construction of shared LLM instances
+_LLM_LOCK = threading.Lock()
+
+
+# Worker threads for blocking crew kickoffs
+_EXECUTOR = ThreadPoolExecutor(
+    max_workers=settings.AGENT_WORKERS,
+    thread_name_prefix="crew"
+)
+
+
+async def run_blocking(func: Callable[..., Any], *args: Any) -> Any:
+    """
+    Run a blocking call on the crew executor.
+
+    The caller's contextvars (e.g. the bound run_id) are carried over to
+    the worker thread.
+    """
+    loop = asyncio.get_running_loop()
+    context = contextvars.copy_context()
+    return await loop.run_in_executor(
+        _EXECUTOR,
+        functools.partial(context.run, func, *args)
+    )
+
+
+def log_step(step: Any) -> None:
+    """
+    CrewAI step_callback recording each agent step as a structlog event.
+
+    CrewAI prints its verbose trace with print() rather than logging, so
+    its callbacks are the way to get steps into structured logs.
+    """
+    logger.debug(
+        "agent_step",
+        step=type(step).__name__,
+        tool=getattr(step, "tool", None),
+        thought=getattr(step, "thought", None)
+    )
+
+
+def log_task(output: Any) -> None:
+    """CrewAI task_callback recording each finished task as a structlog event."""
+    logger.info(
+        "task_completed",
+        agent=getattr(output, "agent", None),
+        summary=getattr(output, "summary", None)
+    )
+
+
+def to_json(value: Any) -> str:
+    """
+    Serialize a context value to compact JSON for prompt embedding.
+
+    Keys are sorted so equal values always render identically, which keeps
+    prompts stable for the LLM response cache and task deduplication.
+    """
+    return orjson.dumps(
+        value,
+        default=str,
+        option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS
+    ).decode()
+
+
+@dataclass(slots=True, frozen=True)
+class ProjectContext:
+    """
+    Project information passed to agents, with every structured field
+    serialized to JSON once instead of on every prompt build.
+    """
+    project_name: str = "Unknown Project"
+    requirements_json: str = "{}"
+    architecture_json: str = "{}"
+    api_spec_json: str = "{}"
+    design_spec_json: str = "{}"
+    data_model_json: str = "{}"
+    api_endpoints_json: str = "[]"
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ProjectContext":
+        """
+        Build a context from a plain project dictionary.
+
+        Args:
+            data: Project information and requirements
+
+        Returns:
+            ProjectContext with structured fields pre-serialized
+        """
+        return cls(
+            project_name=data.get("project_name", "Unknown Project"),
+            requirements_json=to_json(data.get("requirements", {})),
+            architecture_json=to_json(data.get("architecture", {})),
+            api_spec_json=to_json(data.get("api_spec", {})),
+            design_spec_json=to_json(data.get("design_spec", {})),
+            data_model_json=to_json(data.get("data_model", {})),
+            api_endpoints_json=to_json(data.get("api_endpoints", [])),
+        )
+
+
+@dataclass(slots=True, frozen=True)
+class TaskSpec:
+    """
+    Prompt of a single agent task.
+
+    Kept separate from crewai.Task so prompts can be built (e.g. for the
+    Batch API) without constructing the CrewAI agent and its LLM. Tasks
+    that build on the previous task's output set uses_previous_output; the
+    dependency is then passed to CrewAI explicitly and the tasks are never
+    batched together.
+    """
+    description: str
+    expected_output: str
+    uses_previous_output: bool = False
+
+
 class LLMProvider:
     """Factory for creating LLM instances based on configuration."""
 
@@ -54,7 +186,12 @@ class LLMProvider:
         temperature: float = 0.7
     ) -> Any:
         """
-        Create an LLM instance based on the specified provider.
+        Get the shared LLM instance for the specified provider.
+
+        Instances are memoized on (provider, model, temperature) so that all
+        agents share one crewai.LLM. CrewAI uses a crewai.LLM as given (any
+        other object is rebuilt into one), so this is the instance whose
+        calls actually reach the provider through litellm.
 
         Args:
             provider: LLM provider name (openai, anthropic, openrouter)
@@ -67,21 +204,62 @@ class LLMProvider:
         provider = provider or settings.DEFAULT_LLM_PROVIDER
         model = model or settings.DEFAULT_MODEL
 
+        with _LLM_LOCK:
+            return LLMProvider._create_shared(provider, model, temperature)
+
+    @staticmethod
+    @functools.lru_cache(maxsize=None)
+    def _create_shared(provider: str, model: str, temperature: float) -> Any:
+        """Memoized construction backing create()."""
+        return LLMProvider.create_uncached(provider, model, temperature)
+
+    @staticmethod
+    def create_uncached(
+        provider: Optional[str] = None,
+        model: Optional[str] = None,
+        temperature: float = 0.7
+    ) -> Any:
+        """
+        Create a new, unshared LLM instance.
+
+        Args:
+            provider: LLM provider name (openai, anthropic, openrouter)
+            model: Model identifier
+            temperature: Sampling temperature
+
+        Returns:
+            Rate-limited LLM instance; a CachingLLM when
+            settings.LLM_CACHE_ENABLED is set
+        """
+        llm_class = CachingLLM if settings.LLM_CACHE_ENABLED else ThrottledLLM
+        return LLMProvider._create_model(provider, model, temperature, llm_class)
+
+    @staticmethod
+    def _create_model(
+        provider: Optional[str],
+        model: Optional[str],
+        temperature: float,
+        llm_class: type = LLM
+    ) -> LLM:
+        """Instantiate the crewai.LLM for a provider (litellm model naming)."""
+        provider = provider or settings.DEFAULT_LLM_PROVIDER
+        model = model or settings.DEFAULT_MODEL
+
         if provider == "openai":
-            return ChatOpenAI(
-                model=model,
+            return llm_class(
+                model=f"openai/{model}",
                 temperature=temperature,
                 api_key=settings.OPENAI_API_KEY
             )
         elif provider == "anthropic":
-            return ChatAnthropic(
-                model=model,
+            return llm_class(
+                model=f"anthropic/{model}",
                 temperature=temperature,
                 api_key=settings.ANTHROPIC_API_KEY
             )
         elif provider == "openrouter":
-            return ChatOpenAI(
-                model=model,
+            return llm_class(
+                model=f"openrouter/{model}",
                 temperature=temperature,
                 api_key=settings.OPENROUTER_API_KEY,
                 base_url=settings.OPENROUTER_BASE_URL
@@ -96,6 +274,9 @@ class BaseAgent(ABC):
     Provides common functionality and enforces interface contracts.
     """
 
+    # Collapse independent tasks into a single LLM request (see batch())
+    batch_tasks: bool = False
+
     def __init__(self, config: AgentConfig):
         """
         Initialize the base agent.
@@ -104,14 +285,21 @@ class BaseAgent(ABC):
             config: Agent configuration
         """
         self.config = config
-        self.llm = LLMProvider.create()
         self._agent: Optional[Agent] = None
+        self._crew: Optional[Crew] = None
+        self._run_lock = threading.Lock()
+
+        if logger.is_enabled_for(logging.INFO):
+            logger.info(
+                "agent_initialized",
+                role=config.role.value,
+                goal=config.goal[:50]
+            )
 
-        logger.info(
-            "agent_initialized",
-            role=config.role.value,
-            goal=config.goal[:50]
-        )
+    @functools.cached_property
+    def llm(self) -> Any:
+        """LLM used by this agent, resolved on first use."""
+        return LLMProvider.create()
 
     @property
     def agent(self) -> Agent:
@@ -135,48 +323,182 @@ class BaseAgent(ABC):
         )
 
     @abstractmethod
-    def get_tasks(self, context: Dict[str, Any]) -> List[Task]:
+    def get_task_specs(self, context: ProjectContext) -> List[TaskSpec]:
         """
-        Get the list of tasks this agent can perform.
+        Get the prompts of the tasks this agent can perform.
 
         Args:
             context: Execution context with project information
 
         Returns:
-            List of Task instances
+            List of TaskSpec instances
         """
         pass
 
-    def execute(self, context: Dict[str, Any]) -> Dict[str, Any]:
+    def get_tasks(self, context: ProjectContext) -> List[Task]:
         """
-        Execute the agent's tasks within a crew.
+        Get the list of tasks this agent can perform, bound to its CrewAI agent.
 
         Args:
-            context: Execution context
+            context: Execution context with project information
 
         Returns:
-            Execution results
+            List of Task instances
         """
-        tasks = self.get_tasks(context)
+        tasks: List[Task] = []
+        for spec in self.get_task_specs(context):
+            options: Dict[str, Any] = {}
+            if spec.uses_previous_output and tasks:
+                options["context"] = [tasks[-1]]
+            tasks.append(Task(
+                description=spec.description,
+                expected_output=spec.expected_output,
+                agent=self.agent,
+                **options
+            ))
+        return tasks
+
+    def get_batched_tasks(self, context: ProjectContext) -> Tuple[List[Task], int]:
+        """
+        Get this agent's tasks, batched into a single prompt when possible.
 
-        if not tasks:
-            logger.warning("no_tasks_defined", role=self.config.role.value)
-            return {"status": "no_tasks", "results": []}
+        Args:
+            context: Execution context with project information
+
+        Returns:
+            Tuple of (tasks to run, batch size); batch size is 0 when the
+            tasks were left unbatched
+        """
+        return self.batch(self.get_tasks(context))
+
+    def batch(self, tasks: List[Task]) -> Tuple[List[Task], int]:
+        """
+        Collapse independent tasks into one Q[i]/A[i] batched prompt.
+
+        The system prompt (role, goal, backstory) is then paid for once and a
+        single request is issued instead of one per task. Tasks are left as-is
+        unless batching is enabled for the agent, there is more than one task
+        and none of them takes another task's output as context (see
+        TaskSpec.uses_previous_output): a batched prompt answers every
+        assignment at once, so no answer could see another.
 
-        crew = Crew(
-            agents=[self.agent],
-            tasks=tasks,
-            verbose=self.config.verbose
+        Args:
+            tasks: Tasks to batch
+
+        Returns:
+            Tuple of (tasks to run, batch size)
+        """
+        if (
+            not self.batch_tasks
+            or len(tasks) < 2
+            or any(isinstance(task.context, list) and task.context for task in tasks)
+        ):
+            return tasks, 0
+
+        questions = "\n\n".join(
+            f"Q[{i}]: {dedent(task.description).strip()}"
+            for i, task in enumerate(tasks, 1)
+        )
+        answers = "\n".join(
+            f"A[{i}]: {task.expected_output}"
+            for i, task in enumerate(tasks, 1)
         )
 
-        logger.info(
-            "executing_agent",
-            role=self.config.role.value,
-            task_count=len(tasks)
+        batched = Task(
+            description=(
+                "Complete each of the following independent assignments.\n\n"
+                f"{questions}"
+            ),
+            expected_output=(
+                "One answer per assignment, in order, each starting on its own "
+                "line with its marker:\n"
+                f"{answers}"
+            ),
+            agent=self.agent
         )
+        return [batched], len(tasks)
+
+    def collect_outputs(self, result: Any, batch_size: int = 0) -> Optional[List[str]]:
+        """
+        Extract one raw output per original task from a crew result.
+
+        Args:
+            result: CrewOutput returned by kickoff
+            batch_size: Batch size returned by batch(); 0 if unbatched
+
+        Returns:
+            List of task outputs in task order, or None when a batched reply
+            is missing an answer; the tasks must then be run unbatched
+        """
+        if not batch_size:
+            return [task_output.raw for task_output in result.tasks_output]
+
+        parts = _ANSWER_MARKER.split(result.raw)
+        answers = {
+            int(index): text.strip()
+            for index, text in zip(parts[1::2], parts[2::2])
+        }
+        outputs = [answers.get(i, "") for i in range(1, batch_size + 1)]
+
+        if not all(outputs):
+            logger.warning(
+                "batched_output_incomplete",
+                role=self.config.role.value,
+                expected=batch_size,
+                received=sum(1 for output in outputs if output)
+            )
+            return None
+
+        return outputs
+
+    def _crew_with(self, tasks: List[Task]) -> Crew:
+        """Get this agent's crew, reusing it and only swapping its tasks."""
+        if self._crew is None:
+            self._crew = Crew(
+                agents=[self.agent],
+                tasks=tasks,
+                verbose=self.config.verbose,
+                step_callback=log_step,
+                task_callback=log_task
+            )
+        else:
+            self._crew.tasks = tasks
+        return self._crew
+
+    def _kickoff(self, tasks: List[Task]) -> Any:
+        """
+        Run tasks on this agent's crew.
+
+        Runs of the same agent are serialized: the reused crew and the CrewAI
+        agent both hold per-run state, so concurrent runs would overwrite
+        each other's tasks and outputs.
+        """
+        with self._run_lock:
+            return self._crew_with(tasks).kickoff()
+
+    def _prepare_run(self, context: ProjectContext) -> Tuple[List[Task], List[Task], int]:
+        """
+        Build the tasks for a run and log its start.
+
+        Returns:
+            Tuple of (tasks, tasks to run, batch size) as returned by batch()
+        """
+        tasks = self.get_tasks(context)
+        batched, batch_size = self.batch(tasks)
 
-        result = crew.kickoff()
+        if not tasks:
+            logger.warning("no_tasks_defined", role=self.config.role.value)
+        else:
+            logger.info(
+                "executing_agent",
+                role=self.config.role.value,
+                task_count=len(batched)
+            )
 
+        return tasks, batched, batch_size
+
+    def _finish_run(self, outputs: List[str]) -> Dict[str, Any]:
+        """Log completion and shape task outputs into execution results."""
         logger.info(
             "agent_completed",
             role=self.config.role.value
@@ -184,5 +506,50 @@ class BaseAgent(ABC):
 
         return {
             "status": "completed",
-            "results": result
+            "results": outputs
         }
+
+    def execute(self, context: ProjectContext) -> Dict[str, Any]:
+        """
+        Execute the agent's tasks within a crew.
+
+        Args:
+            context: Execution context
+
+        Returns:
+            Execution results
+        """
+        tasks, batched, batch_size = self._prepare_run(context)
+        if not tasks:
+            return {"status": "no_tasks", "results": []}
+
+        outputs = self.collect_outputs(self._kickoff(batched), batch_size)
+        if outputs is None:
+            logger.warning("batched_run_retried_unbatched", role=self.config.role.value)
+            outputs = self.collect_outputs(self._kickoff(tasks))
+
+        return self._finish_run(outputs)
+
+    async def aexecute(self, context: ProjectContext) -> Dict[str, Any]:
+        """
+        Execute the agent's tasks without blocking the event loop.
+
+        Only the blocking kickoff is moved to the crew executor; building
+        prompts and parsing outputs stay in the calling coroutine.
+
+        Args:
+            context: Execution context
+
+        Returns:
+            Execution results
+        """
+        tasks, batched, batch_size = self._prepare_run(context)
+        if not tasks:
+            return {"status": "no_tasks", "results": []}
+
+        outputs = self.collect_outputs(await run_blocking(self._kickoff, batched), batch_size)
+        if outputs is None:
+            logger.warning("batched_run_retried_unbatched", role=self.config.role.value)
+            outputs = self.collect_outputs(await run_blocking(self._kickoff, tasks))
+
+        return self._finish_run(outputs)
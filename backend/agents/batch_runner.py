@@ -0,0 +1,240 @@
+"""
+Batch Runner
+Submits agent tasks to provider Batch APIs for non-latency-critical phases.
+"""
+import asyncio
+import json
+from dataclasses import dataclass
+from textwrap import dedent
+from typing import Dict, List, Optional, Sequence
+import structlog
+
+from anthropic import AsyncAnthropic
+from openai import AsyncOpenAI
+
+from agents.base import BaseAgent, TaskSpec
+from core.config import settings
+
+logger = structlog.get_logger(__name__)
+
+BATCH_ENDPOINT = "/v1/chat/completions"
+COMPLETION_WINDOW = "24h"
+
+# Polling backoff bounds in seconds
+POLL_INITIAL_DELAY = 5
+POLL_MAX_DELAY = 300
+
+SUPPORTED_PROVIDERS = {"openai", "anthropic"}
+
+
+@dataclass
+class BatchRequest:
+    """A single prompt inside a provider batch."""
+    custom_id: str
+    system: str
+    prompt: str
+
+
+@dataclass
+class BatchOutcome:
+    """Collected results of a finished batch."""
+    status: str
+    outputs: Dict[str, str]
+    errors: List[str]
+
+
+def build_requests(agent: BaseAgent, tasks: Sequence[TaskSpec]) -> List[BatchRequest]:
+    """
+    Convert an agent's task prompts into batch requests.
+
+    Only the agent's configuration is read; its CrewAI agent and LLM are
+    never built.
+
+    Args:
+        agent: Agent owning the tasks
+        tasks: Task prompts to serialize
+
+    Returns:
+        One BatchRequest per task, identified as "<role>:<index>"
+    """
+    config = agent.config
+    system = (
+        f"You are a {config.role.value.replace('_', ' ')}. {config.backstory}\n\n"
+        f"Your goal: {config.goal}"
+    )
+
+    return [
+        BatchRequest(
+            custom_id=f"{config.role.value}:{index}",
+            system=system,
+            prompt=(
+                f"{dedent(task.description).strip()}\n\n"
+                f"Expected output: {task.expected_output}"
+            )
+        )
+        for index, task in enumerate(tasks)
+    ]
+
+
+def _resolve_provider(provider: Optional[str]) -> str:
+    provider = provider or settings.DEFAULT_LLM_PROVIDER
+    if provider not in SUPPORTED_PROVIDERS:
+        raise ValueError(f"Batch API not supported for provider: {provider}")
+    return provider
+
+
+def _openai_client() -> AsyncOpenAI:
+    return AsyncOpenAI(api_key=settings.OPENAI_API_KEY, base_url=settings.OPENAI_BASE_URL)
+
+
+def _anthropic_client() -> AsyncAnthropic:
+    return AsyncAnthropic(api_key=settings.ANTHROPIC_API_KEY)
+
+
+async def submit_batch(
+    requests: List[BatchRequest],
+    provider: Optional[str] = None,
+    model: Optional[str] = None
+) -> str:
+    """
+    Submit requests to the provider Batch API.
+
+    Args:
+        requests: Prompts to submit
+        provider: LLM provider name (openai, anthropic)
+        model: Model identifier
+
+    Returns:
+        Provider batch ID
+    """
+    provider = _resolve_provider(provider)
+    model = model or settings.DEFAULT_MODEL
+
+    if provider == "openai":
+        lines = [
+            json.dumps({
+                "custom_id": request.custom_id,
+                "method": "POST",
+                "url": BATCH_ENDPOINT,
+                "body": {
+                    "model": model,
+                    "max_tokens": settings.DEFAULT_MAX_TOKENS,
+                    "messages": [
+                        {"role": "system", "content": request.system},
+                        {"role": "user", "content": request.prompt},
+                    ],
+                },
+            })
+            for request in requests
+        ]
+
+        client = _openai_client()
+        input_file = await client.files.create(
+            file=("batch.jsonl", "\n".join(lines).encode()),
+            purpose="batch"
+        )
+        batch = await client.batches.create(
+            input_file_id=input_file.id,
+            endpoint=BATCH_ENDPOINT,
+            completion_window=COMPLETION_WINDOW
+        )
+    else:
+        client = _anthropic_client()
+        batch = await client.messages.batches.create(
+            requests=[
+                {
+                    "custom_id": request.custom_id,
+                    "params": {
+                        "model": model,
+                        "max_tokens": settings.DEFAULT_MAX_TOKENS,
+                        "system": request.system,
+                        "messages": [{"role": "user", "content": request.prompt}],
+                    },
+                }
+                for request in requests
+            ]
+        )
+
+    logger.info(
+        "batch_submitted",
+        provider=provider,
+        batch_id=batch.id,
+        request_count=len(requests)
+    )
+    return batch.id
+
+
+async def poll_batch(batch_id: str, provider: Optional[str] = None) -> BatchOutcome:
+    """
+    Wait for a batch to finish, backing off exponentially between polls.
+
+    Args:
+        batch_id: Provider batch ID returned by submit_batch
+        provider: LLM provider name (openai, anthropic)
+
+    Returns:
+        BatchOutcome with outputs keyed by custom_id
+    """
+    provider = _resolve_provider(provider)
+    client = _openai_client() if provider == "openai" else _anthropic_client()
+    delay = POLL_INITIAL_DELAY
+
+    while True:
+        if provider == "openai":
+            batch = await client.batches.retrieve(batch_id)
+            done = batch.status in {"completed", "failed", "expired", "cancelled"}
+        else:
+            batch = await client.messages.batches.retrieve(batch_id)
+            done = batch.processing_status == "ended"
+
+        if done:
+            break
+
+        logger.debug("batch_pending", batch_id=batch_id, retry_in=delay)
+        await asyncio.sleep(delay)
+        delay = min(delay * 2, POLL_MAX_DELAY)
+
+    if provider == "openai":
+        return await _collect_openai(client, batch)
+    return await _collect_anthropic(client, batch_id)
+
+
+async def _collect_openai(client: AsyncOpenAI, batch) -> BatchOutcome:
+    if batch.status != "completed":
+        return BatchOutcome(status="failed", outputs={}, errors=[f"Batch {batch.id} {batch.status}"])
+
+    outputs: Dict[str, str] = {}
+    errors: List[str] = []
+
+    if batch.output_file_id:
+        content = await client.files.content(batch.output_file_id)
+        for line in content.text.splitlines():
+            entry = json.loads(line)
+            response = entry.get("response") or {}
+            if entry.get("error") or response.get("status_code") != 200:
+                errors.append(f"{entry['custom_id']}: {entry.get('error') or response.get('body')}")
+                continue
+            outputs[entry["custom_id"]] = response["body"]["choices"][0]["message"]["content"]
+
+    if batch.error_file_id:
+        content = await client.files.content(batch.error_file_id)
+        for line in content.text.splitlines():
+            entry = json.loads(line)
+            errors.append(f"{entry['custom_id']}: {entry.get('error')}")
+
+    return BatchOutcome(status="failed" if errors else "completed", outputs=outputs, errors=errors)
+
+
+async def _collect_anthropic(client: AsyncAnthropic, batch_id: str) -> BatchOutcome:
+    outputs: Dict[str, str] = {}
+    errors: List[str] = []
+
+    async for entry in await client.messages.batches.results(batch_id):
+        if entry.result.type == "succeeded":
+            outputs[entry.custom_id] = "".join(
+                block.text for block in entry.result.message.content if block.type == "text"
+            )
+        else:
+            errors.append(f"{entry.custom_id}: {entry.result.type}")
+
+    return BatchOutcome(status="failed" if errors else "completed", outputs=outputs, errors=errors)
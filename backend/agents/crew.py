@@ -2,14 +2,30 @@
 Crew Orchestration
 Manages the coordination of multiple AI agents for project execution.
 """
-from typing import Any, Dict, List, Optional
+import asyncio
+import hashlib
+import uuid
+from types import MappingProxyType
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple, Type
 from enum import Enum
-from dataclasses import dataclass
+from dataclasses import dataclass, field, replace
 import structlog
-
-from crewai import Crew, Process
-
-from agents.base import BaseAgent
+import structlog.contextvars
+
+from crewai import Crew, Process, Task
+
+from agents.base import (
+    BaseAgent,
+    AgentRole,
+    ProjectContext,
+    log_step,
+    log_task,
+    run_blocking,
+    to_json,
+)
+from agents.batch_runner import build_requests, submit_batch, poll_batch
+from agents.llm_cache import cache_project
+from agents.task_cache import TaskCache
 from agents.development import (
     ArchitectAgent,
     BackendDeveloperAgent,
@@ -22,6 +38,7 @@ from agents.operations import (
     SecurityAnalystAgent,
     TechnicalWriterAgent,
 )
+from core.config import settings
 
 logger = structlog.get_logger(__name__)
 
@@ -36,13 +53,36 @@ class ProjectPhase(str, Enum):
     DOCUMENTATION = "documentation"
 
 
-@dataclass
+# Phases whose results are not latency-critical and may use provider Batch APIs
+BATCH_PHASES = frozenset({ProjectPhase.TESTING, ProjectPhase.DOCUMENTATION})
+
+# Agent keys responsible for each phase
+_PHASE_MAP: Mapping[ProjectPhase, Tuple[str, ...]] = MappingProxyType({
+    ProjectPhase.PLANNING: ("architect",),
+    ProjectPhase.ARCHITECTURE: ("architect", "database", "security"),
+    ProjectPhase.DEVELOPMENT: ("backend", "frontend", "database"),
+    ProjectPhase.TESTING: ("qa", "security"),
+    ProjectPhase.DEPLOYMENT: ("devops",),
+    ProjectPhase.DOCUMENTATION: ("writer",),
+})
+
+
+@dataclass(slots=True, frozen=True)
 class CrewResult:
     """Result from crew execution."""
     phase: ProjectPhase
     status: str
-    outputs: Dict[str, Any]
-    errors: List[str]
+    outputs: Dict[str, Any] = field(default_factory=dict)
+    errors: Tuple[str, ...] = ()
+
+
+def task_key(task: Task) -> str:
+    """Content hash identifying tasks with identical prompts."""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(task.description.encode())
+    digest.update(b"\0")
+    digest.update(task.expected_output.encode())
+    return digest.hexdigest()
 
 
 class ProjectCrew:
@@ -51,97 +91,352 @@ class ProjectCrew:
     Manages the workflow through different project phases.
     """
 
-    def __init__(self, project_context: Dict[str, Any]):
+    def __init__(
+        self,
+        project_context: Dict[str, Any],
+        max_concurrency: Optional[int] = None,
+        use_batch_api: bool = False
+    ):
         """
         Initialize the project crew.
 
         Args:
-            project_context: Project information and requirements
+            project_context: Project information and requirements. Its
+                "project_id" (the database id) identifies the project in
+                shared caches; without it submitted batches are not
+                persisted and semantic LLM cache hits are disabled
+            max_concurrency: Maximum number of agent crews running at once
+                within a phase (defaults to settings.AGENT_MAX_CONCURRENCY)
+            use_batch_api: Run BATCH_PHASES through the provider Batch API
+                (cheaper, but results may take up to 24 hours)
         """
-        self.context = project_context
+        self.context = ProjectContext.from_dict(project_context)
+        self.project_id: Optional[Any] = project_context.get("project_id")
         self.results: List[CrewResult] = []
+        self.max_concurrency = max_concurrency or settings.AGENT_MAX_CONCURRENCY
+        self.use_batch_api = use_batch_api
 
-        # Initialize all agents
-        self.agents = {
-            "architect": ArchitectAgent(),
-            "backend": BackendDeveloperAgent(),
-            "frontend": FrontendDeveloperAgent(),
-            "database": DatabaseEngineerAgent(),
-            "devops": DevOpsEngineerAgent(),
-            "qa": QAEngineerAgent(),
-            "security": SecurityAnalystAgent(),
-            "writer": TechnicalWriterAgent(),
+        # Agents are instantiated on first use by _get()
+        self._agent_classes: Dict[str, Type[BaseAgent]] = {
+            "architect": ArchitectAgent,
+            "backend": BackendDeveloperAgent,
+            "frontend": FrontendDeveloperAgent,
+            "database": DatabaseEngineerAgent,
+            "devops": DevOpsEngineerAgent,
+            "qa": QAEngineerAgent,
+            "security": SecurityAnalystAgent,
+            "writer": TechnicalWriterAgent,
         }
+        self._agents: Dict[str, BaseAgent] = {}
+        # Crews are reused across phases and runs; see _crew_for()
+        self._crew_cache: Dict[Tuple[Tuple[int, ...], bool], Crew] = {}
+
+        # Task outputs keyed by task_key(), reused across phases and runs.
+        # With a cache file, outputs are looked up there as phases need them.
+        self._task_results: Dict[str, str] = {}
+        self._task_cache: Optional[TaskCache] = None
+        if settings.AGENT_TASK_CACHE_PATH:
+            self._task_cache = TaskCache(settings.AGENT_TASK_CACHE_PATH)
 
         logger.info(
             "crew_initialized",
-            project=project_context.get("project_name"),
-            agent_count=len(self.agents)
+            project=self.context.project_name,
+            agent_count=len(self._agent_classes)
         )
 
-    def execute_phase(self, phase: ProjectPhase) -> CrewResult:
+    def _get(self, key: str) -> BaseAgent:
+        """Get the agent for a key, instantiating it on first use."""
+        agent = self._agents.get(key)
+        if agent is None:
+            agent = self._agents[key] = self._agent_classes[key]()
+        return agent
+
+    async def execute_phase(self, phase: ProjectPhase) -> CrewResult:
         """
         Execute a specific project phase.
 
+        Agents within a phase are independent, so each one gets its own
+        crew and all of them run concurrently (bounded by max_concurrency).
+        Tasks whose prompt matches one already answered (see task_key) are
+        not sent again; the earlier output is reused.
+
         Args:
             phase: The phase to execute
 
         Returns:
-            CrewResult with phase outputs
+            CrewResult with per-task outputs keyed by agent role
         """
         logger.info("executing_phase", phase=phase.value)
 
-        phase_agents = self._get_phase_agents(phase)
-        all_tasks = []
+        if self.use_batch_api and phase in BATCH_PHASES:
+            return await self._execute_batch_phase(phase)
 
-        for agent in phase_agents:
+        # Scope semantic LLM cache hits to this project (none without an id);
+        # the value is inherited by the gathered kickoffs and their worker threads
+        token = cache_project.set(self._project_key)
+        try:
+            return await self._execute_crews(phase)
+        finally:
+            cache_project.reset(token)
+
+    async def _execute_crews(self, phase: ProjectPhase) -> CrewResult:
+        """Run a phase's agents on concurrent crews (see execute_phase)."""
+        crews: Dict[str, Crew] = {}
+        batches: Dict[str, Tuple[BaseAgent, List[Task], int]] = {}
+        task_keys: Dict[str, List[str]] = {}
+        pending_keys: Dict[str, List[str]] = {}
+        resolved: Dict[str, str] = {}
+
+        phase_tasks: List[Tuple[BaseAgent, List[Task]]] = []
+        for agent in self._get_phase_agents(phase):
             tasks = agent.get_tasks(self.context)
-            all_tasks.extend(tasks)
+            if tasks:
+                phase_tasks.append((agent, tasks))
+                task_keys[agent.config.role.value] = [task_key(task) for task in tasks]
+
+        await self._load_task_results(
+            key for keys in task_keys.values() for key in keys
+        )
 
-        if not all_tasks:
+        for agent, tasks in phase_tasks:
+            role = agent.config.role.value
+            keys = task_keys[role]
+
+            # Skip tasks answered by an earlier run, or already claimed by
+            # another agent in this phase; their outputs are linked below
+            todo = []
+            for key, task in zip(keys, tasks):
+                if key in self._task_results:
+                    resolved[key] = self._task_results[key]
+                elif key not in resolved:
+                    resolved[key] = None
+                    todo.append((key, task))
+
+            if todo:
+                pending_keys[role] = [key for key, _ in todo]
+                todo_tasks = [task for _, task in todo]
+                batched, batch_size = agent.batch(todo_tasks)
+                batches[role] = (agent, todo_tasks, batch_size)
+                crews[role] = self._crew_for([agent], batched, verbose=settings.AGENT_VERBOSE)
+
+        if not task_keys:
             return CrewResult(
                 phase=phase,
                 status="skipped",
                 outputs={},
-                errors=["No tasks defined for this phase"]
+                errors=("No tasks defined for this phase",)
             )
 
-        crew = Crew(
-            agents=[a.agent for a in phase_agents],
-            tasks=all_tasks,
-            process=Process.sequential,
-            verbose=True
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        outputs: Dict[str, Any] = {}
+
+        def resolve(role: str) -> bool:
+            values = [resolved.get(key) for key in task_keys[role]]
+            if any(value is None for value in values):
+                return False
+            outputs[role] = values
+            # Publish each agent's output as soon as it lands rather than
+            # after the slowest crew in the phase has finished
+            self._update_context(phase, {role: values})
+            return True
+
+        async def run(crew: Crew) -> Any:
+            async with semaphore:
+                return await run_blocking(crew.kickoff)
+
+        async def kickoff(role: str, crew: Crew) -> None:
+            agent, todo_tasks, batch_size = batches[role]
+            values = agent.collect_outputs(await run(crew), batch_size)
+            if values is None:
+                # A batched reply missing an answer is never published
+                logger.warning("batched_run_retried_unbatched", role=role)
+                crew = self._crew_for([agent], todo_tasks, verbose=settings.AGENT_VERBOSE)
+                values = agent.collect_outputs(await run(crew))
+            answers = dict(zip(pending_keys[role], values))
+            resolved.update(answers)
+            await self._store_task_results(answers)
+            resolve(role)
+
+        for role in task_keys:
+            if role not in crews:
+                resolve(role)
+
+        results = await asyncio.gather(
+            *(kickoff(role, crew) for role, crew in crews.items()),
+            return_exceptions=True
         )
 
-        try:
-            result = crew.kickoff()
+        errors: List[str] = []
 
+        for role, result in zip(crews, results):
+            if isinstance(result, BaseException):
+                logger.error(
+                    "agent_failed",
+                    phase=phase.value,
+                    role=role,
+                    error=str(result)
+                )
+                errors.append(f"{role}: {result}")
+
+        # Roles whose tasks were deduplicated into another agent's crew
+        for role in task_keys:
+            if role not in outputs and role not in crews and not resolve(role):
+                errors.append(f"{role}: shared task did not complete")
+
+        if errors:
+            logger.error("phase_failed", phase=phase.value, errors=errors)
+            crew_result = CrewResult(
+                phase=phase,
+                status="failed",
+                outputs=outputs,
+                errors=tuple(errors)
+            )
+        else:
             crew_result = CrewResult(
                 phase=phase,
                 status="completed",
-                outputs={"result": result},
-                errors=[]
+                outputs=outputs
+            )
+
+        self.results.append(crew_result)
+        return crew_result
+
+    async def _execute_batch_phase(self, phase: ProjectPhase) -> CrewResult:
+        """
+        Execute a phase through the provider Batch API.
+
+        The batch ID is recorded in self.results as a "batch_pending" result
+        before polling starts. When settings.AGENT_TASK_CACHE_PATH is set it
+        is also persisted there, so after a restart resume_pending_batches()
+        on a ProjectCrew for the same project collects the results instead
+        of paying for the batch again. Executing a phase whose batch is
+        still pending resumes that batch rather than submitting a new one.
+        """
+        await self._restore_pending_batches()
+        for result in self.results:
+            if result.phase == phase and result.status == "batch_pending":
+                logger.info(
+                    "batch_resumed",
+                    phase=phase.value,
+                    batch_id=result.outputs["batch_id"]
+                )
+                return await self.resume_batch(result)
+
+        requests = []
+        for agent in self._get_phase_agents(phase):
+            requests.extend(build_requests(agent, agent.get_task_specs(self.context)))
+
+        if not requests:
+            return CrewResult(
+                phase=phase,
+                status="skipped",
+                outputs={},
+                errors=("No tasks defined for this phase",)
             )
 
-            # Update context with phase outputs
-            self._update_context(phase, result)
+        provider = settings.DEFAULT_LLM_PROVIDER
 
+        try:
+            batch_id = await submit_batch(requests, provider)
         except Exception as e:
             logger.error("phase_failed", phase=phase.value, error=str(e))
             crew_result = CrewResult(
                 phase=phase,
                 status="failed",
                 outputs={},
-                errors=[str(e)]
+                errors=(str(e),)
             )
+            self.results.append(crew_result)
+            return crew_result
 
-        self.results.append(crew_result)
+        pending = CrewResult(
+            phase=phase,
+            status="batch_pending",
+            outputs={"batch_id": batch_id, "provider": provider}
+        )
+        self.results.append(pending)
+        await self._persist_batch(phase, pending.outputs)
+
+        return await self.resume_batch(pending)
+
+    async def resume_batch(self, pending: CrewResult) -> CrewResult:
+        """
+        Wait for a submitted batch and replace its pending result.
+
+        Args:
+            pending: "batch_pending" result recorded by execute_phase
+
+        Returns:
+            CrewResult with per-task outputs keyed by agent role
+        """
+        phase = pending.phase
+
+        try:
+            outcome = await poll_batch(
+                pending.outputs["batch_id"],
+                pending.outputs["provider"]
+            )
+        except Exception as e:
+            logger.error("phase_failed", phase=phase.value, error=str(e))
+            outcome = None
+            errors = [str(e)]
+
+        outputs: Dict[str, Any] = {}
+
+        if outcome is not None:
+            errors = outcome.errors
+            # custom_id is "<role>:<task index>"
+            ordered = sorted(
+                outcome.outputs.items(),
+                key=lambda item: int(item[0].rsplit(":", 1)[1])
+            )
+            for custom_id, text in ordered:
+                outputs.setdefault(custom_id.rsplit(":", 1)[0], []).append(text)
+
+        if errors:
+            logger.error("phase_failed", phase=phase.value, errors=errors)
+
+        crew_result = CrewResult(
+            phase=phase,
+            status="failed" if errors else "completed",
+            outputs=outputs,
+            errors=tuple(errors)
+        )
+
+        if not errors:
+            self._update_context(phase, outputs)
+
+        # A batch that could not be polled stays pending for a later resume
+        if outcome is not None:
+            await self._persist_batch(phase, None)
+
+        self.results[self.results.index(pending)] = crew_result
         return crew_result
 
-    def execute_full_pipeline(self) -> List[CrewResult]:
+    async def resume_pending_batches(self) -> List[CrewResult]:
+        """
+        Resume polling for every batch still marked as pending.
+
+        Batches this project submitted in an earlier process and recorded
+        in the task cache file are picked up too.
+
+        Returns:
+            Results of the resumed phases
+        """
+        await self._restore_pending_batches()
+        pending = [r for r in self.results if r.status == "batch_pending"]
+        return [await self.resume_batch(result) for result in pending]
+
+    async def aexecute_full_pipeline(self) -> List[CrewResult]:
         """
         Execute the complete development pipeline.
 
+        Phases run one after another; each phase is awaited in full before
+        the next one starts so that its outputs are available in the context.
+        While a phase is generating, the next phase's agents (LLM clients,
+        tools, CrewAI agents) are built in a worker thread, since none of
+        that depends on the outputs still being produced.
+
         Returns:
             List of results from each phase
         """
@@ -154,39 +449,148 @@ class ProjectCrew:
             ProjectPhase.DOCUMENTATION,
         ]
 
-        for phase in phases:
-            result = self.execute_phase(phase)
-
-            if result.status == "failed":
-                logger.error(
-                    "pipeline_stopped",
-                    failed_phase=phase.value,
-                    errors=result.errors
-                )
-                break
+        # Tag every log line of this run, including those from worker threads
+        with structlog.contextvars.bound_contextvars(run_id=uuid.uuid4().hex):
+            for index, phase in enumerate(phases):
+                prefetch = None
+                if index + 1 < len(phases):
+                    prefetch = asyncio.create_task(
+                        asyncio.to_thread(self._prepare_agents, phases[index + 1], phase)
+                    )
+
+                result = await self.execute_phase(phase)
+
+                if prefetch is not None:
+                    try:
+                        await prefetch
+                    except Exception as e:
+                        # Preparation is retried lazily when the phase runs
+                        logger.warning("agent_prefetch_failed", error=str(e))
+
+                if result.status == "failed":
+                    logger.error(
+                        "pipeline_stopped",
+                        failed_phase=phase.value,
+                        errors=result.errors
+                    )
+                    break
 
         return self.results
 
-    def _get_phase_agents(self, phase: ProjectPhase) -> List[BaseAgent]:
+    def execute_full_pipeline(self) -> List[CrewResult]:
+        """
+        Synchronous wrapper around aexecute_full_pipeline.
+
+        Returns:
+            List of results from each phase
+        """
+        return asyncio.run(self.aexecute_full_pipeline())
+
+    async def _load_task_results(self, keys: Iterable[str]) -> None:
+        """Fetch the stored outputs of keys not yet known from the cache file."""
+        missing = [key for key in keys if key not in self._task_results]
+        if self._task_cache is not None and missing:
+            self._task_results.update(
+                await run_blocking(self._task_cache.get_outputs, missing)
+            )
+
+    async def _store_task_results(self, answers: Dict[str, str]) -> None:
+        """Remember task outputs, persisting them when a cache file is configured."""
+        # Empty answers (e.g. an empty completion) are not reused
+        answers = {key: text for key, text in answers.items() if text}
+        self._task_results.update(answers)
+
+        if self._task_cache is not None and answers:
+            await run_blocking(self._task_cache.put_outputs, answers)
+
+    @property
+    def _project_key(self) -> Optional[str]:
+        """Identifies this project in shared caches; names are not unique."""
+        return None if self.project_id is None else str(self.project_id)
+
+    async def _restore_pending_batches(self) -> None:
+        """Add this project's batches recorded in the cache file as pending results."""
+        if self._task_cache is None or self._project_key is None:
+            return
+
+        batches = await run_blocking(self._task_cache.get_batches, self._project_key)
+        known = {r.phase for r in self.results if r.status == "batch_pending"}
+        for phase_value, batch in batches.items():
+            phase = ProjectPhase(phase_value)
+            if phase not in known:
+                self.results.append(CrewResult(
+                    phase=phase,
+                    status="batch_pending",
+                    outputs=batch
+                ))
+
+    async def _persist_batch(self, phase: ProjectPhase, batch: Optional[Dict[str, str]]) -> None:
+        """Record (or with None, forget) a submitted batch in the task cache file."""
+        if self._task_cache is None:
+            return
+        if self._project_key is None:
+            if batch is not None:
+                logger.warning("batch_not_persisted", phase=phase.value, reason="no project_id")
+            return
+
+        await run_blocking(
+            self._task_cache.set_batch, self._project_key, phase.value, batch
+        )
+
+    def _crew_for(
+        self,
+        agents: Sequence[BaseAgent],
+        tasks: List[Task],
+        verbose: bool
+    ) -> Crew:
+        """
+        Get a crew for the given agents with its task list replaced.
+
+        Building a Crew runs CrewAI's agent validation and memory setup, so
+        one crew is kept per (agent set, verbosity) and only its tasks are
+        swapped between runs.
+        """
+        key = (tuple(id(agent) for agent in agents), verbose)
+        crew = self._crew_cache.get(key)
+        if crew is None:
+            crew = self._crew_cache[key] = Crew(
+                agents=[agent.agent for agent in agents],
+                tasks=tasks,
+                process=Process.sequential,
+                verbose=verbose,
+                step_callback=log_step,
+                task_callback=log_task
+            )
+        else:
+            crew.tasks = tasks
+        return crew
+
+    def _get_phase_agents(self, phase: ProjectPhase) -> Tuple[BaseAgent, ...]:
         """Get agents responsible for a specific phase."""
-        phase_mapping = {
-            ProjectPhase.PLANNING: ["architect"],
-            ProjectPhase.ARCHITECTURE: ["architect", "database", "security"],
-            ProjectPhase.DEVELOPMENT: ["backend", "frontend", "database"],
-            ProjectPhase.TESTING: ["qa", "security"],
-            ProjectPhase.DEPLOYMENT: ["devops"],
-            ProjectPhase.DOCUMENTATION: ["writer"],
-        }
+        return tuple(self._get(key) for key in _PHASE_MAP.get(phase, ()))
+
+    def _prepare_agents(self, phase: ProjectPhase, current: ProjectPhase) -> None:
+        """
+        Build the agents of an upcoming phase ahead of time.
 
-        agent_keys = phase_mapping.get(phase, [])
-        return [self.agents[key] for key in agent_keys]
+        Agents shared with the running phase are skipped; that phase has
+        already built them and may be using them from another thread.
+        """
+        in_use = _PHASE_MAP.get(current, ())
+        for key in _PHASE_MAP.get(phase, ()):
+            if key not in in_use:
+                self._get(key).agent
 
-    def _update_context(self, phase: ProjectPhase, result: Any) -> None:
+    def _update_context(self, phase: ProjectPhase, outputs: Dict[str, Any]) -> None:
         """Update project context with phase outputs."""
+        architect_output = outputs.get(AgentRole.ARCHITECT.value)
+        if architect_output is None:
+            return
+
         if phase == ProjectPhase.ARCHITECTURE:
-            self.context["architecture"] = result
+            self.context = replace(self.context, architecture_json=to_json(architect_output))
         elif phase == ProjectPhase.PLANNING:
-            self.context["api_spec"] = result
+            self.context = replace(self.context, api_spec_json=to_json(architect_output))
 
 
 class AgentFactory:
@@ -224,6 +628,7 @@ class AgentFactory:
     @staticmethod
     def create_development_crew(context: Dict[str, Any]) -> Crew:
         """Create a crew focused on development tasks."""
+        project_context = ProjectContext.from_dict(context)
         agents = [
             ArchitectAgent(),
             BackendDeveloperAgent(),
@@ -233,18 +638,21 @@ class AgentFactory:
 
         all_tasks = []
         for agent in agents:
-            all_tasks.extend(agent.get_tasks(context))
+            all_tasks.extend(agent.get_tasks(project_context))
 
         return Crew(
             agents=[a.agent for a in agents],
             tasks=all_tasks,
             process=Process.sequential,
-            verbose=True
+            verbose=settings.AGENT_VERBOSE,
+            step_callback=log_step,
+            task_callback=log_task
         )
 
     @staticmethod
     def create_review_crew(context: Dict[str, Any]) -> Crew:
         """Create a crew focused on review and quality tasks."""
+        project_context = ProjectContext.from_dict(context)
         agents = [
             QAEngineerAgent(),
             SecurityAnalystAgent(),
@@ -252,11 +660,13 @@ class AgentFactory:
 
         all_tasks = []
         for agent in agents:
-            all_tasks.extend(agent.get_tasks(context))
+            all_tasks.extend(agent.get_tasks(project_context))
 
         return Crew(
             agents=[a.agent for a in agents],
             tasks=all_tasks,
             process=Process.sequential,
-            verbose=True
+            verbose=settings.AGENT_VERBOSE,
+            step_callback=log_step,
+            task_callback=log_task
         )
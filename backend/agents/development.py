@@ -2,16 +2,131 @@
 Development Team Agents
 Specialized agents for software development tasks.
 """
-from typing import Any, Dict, List
-
-from crewai import Task
-from crewai_tools import (
-    FileReadTool,
-    DirectoryReadTool,
-    CodeInterpreterTool,
-)
-
-from agents.base import BaseAgent, AgentConfig, AgentRole
+from string import Template
+from typing import List
+
+from agents.base import BaseAgent, AgentConfig, AgentRole, ProjectContext, TaskSpec
+from agents.tools import FILE_READ, DIR_READ, CODE_INTERPRETER
+
+# Task prompts keep the static instructions first and append per-project
+# data last, so provider prefix caches can reuse the shared prefix. They
+# are compiled once at import and only substituted per call.
+
+_ARCHITECTURE_DOC_TMPL = Template("""
+Analyze the project requirements below and create a comprehensive
+system architecture document that includes:
+
+1. High-level system overview
+2. Component diagram with clear boundaries
+3. Data flow between components
+4. Technology stack recommendations with justifications
+5. Scalability considerations
+6. Security architecture
+7. Integration patterns
+
+Project: $project_name
+Requirements: $requirements
+""")
+
+_API_SPEC_TMPL = Template("""
+Based on the project architecture, create detailed
+API specifications including:
+
+1. RESTful endpoint definitions
+2. Request/Response schemas
+3. Authentication/Authorization flows
+4. Rate limiting strategy
+5. Error handling patterns
+
+Project: $project_name
+""")
+
+_BACKEND_MODELS_TMPL = Template("""
+Implement the database models for the project below based on the
+architecture specification.
+
+Requirements:
+1. Use SQLAlchemy 2.0 with async support
+2. Include all necessary relationships
+3. Add appropriate indexes
+4. Include created_at, updated_at timestamps
+5. Implement soft delete where appropriate
+
+Project: $project_name
+Architecture: $architecture
+""")
+
+_BACKEND_API_TMPL = Template("""
+Implement the REST API endpoints for the project below based on
+the API specification.
+
+Requirements:
+1. Use FastAPI with async/await
+2. Include Pydantic schemas for validation
+3. Implement proper error handling
+4. Add authentication decorators
+5. Include OpenAPI documentation
+
+Project: $project_name
+API Spec: $api_spec
+""")
+
+_FRONTEND_ARCHITECTURE_TMPL = Template("""
+Create the component architecture for the project below.
+
+Requirements:
+1. Define component hierarchy
+2. Plan state management strategy
+3. Design reusable component library
+4. Plan routing structure
+5. Define API integration layer
+
+Project: $project_name
+Design Specification: $design_spec
+""")
+
+_FRONTEND_COMPONENTS_TMPL = Template("""
+Implement React components for the project below based on the
+component architecture.
+
+Requirements:
+1. Use TypeScript with strict mode
+2. Implement with Next.js 14 app router
+3. Use TanStack Query for data fetching
+4. Style with Tailwind CSS
+5. Include loading and error states
+6. Ensure accessibility compliance
+
+Project: $project_name
+API Endpoints: $api_endpoints
+""")
+
+_DATABASE_SCHEMA_TMPL = Template("""
+Design the database schema for the project below.
+
+Requirements:
+1. Define all tables with appropriate data types
+2. Establish primary and foreign keys
+3. Design indexes for common queries
+4. Plan partitioning strategy if needed
+5. Consider denormalization for read performance
+6. Include audit columns
+
+Project: $project_name
+Data Model: $data_model
+""")
+
+_DATABASE_MIGRATIONS_TMPL = Template("""
+Create Alembic migrations for the project below.
+
+Requirements:
+1. Initial schema migration
+2. Seed data migration
+3. Index creation migration
+4. Include rollback procedures
+
+Project: $project_name
+""")
 
 
 class ArchitectAgent(BaseAgent):
@@ -34,56 +149,34 @@ class ArchitectAgent(BaseAgent):
                 "at translating business requirements into technical specifications."
             ),
             tools=[
-                FileReadTool(),
-                DirectoryReadTool(),
+                FILE_READ,
+                DIR_READ,
             ],
             allow_delegation=True
         )
         super().__init__(config)
 
-    def get_tasks(self, context: Dict[str, Any]) -> List[Task]:
+    def get_task_specs(self, context: ProjectContext) -> List[TaskSpec]:
         """Generate architecture tasks based on project context."""
-        project_name = context.get("project_name", "Unknown Project")
-        requirements = context.get("requirements", {})
-
         tasks = [
-            Task(
-                description=f"""
-                Analyze the requirements for {project_name} and create a comprehensive
-                system architecture document that includes:
-
-                1. High-level system overview
-                2. Component diagram with clear boundaries
-                3. Data flow between components
-                4. Technology stack recommendations with justifications
-                5. Scalability considerations
-                6. Security architecture
-                7. Integration patterns
-
-                Requirements: {requirements}
-                """,
+            TaskSpec(
+                description=_ARCHITECTURE_DOC_TMPL.substitute(
+                    project_name=context.project_name,
+                    requirements=context.requirements_json
+                ),
                 expected_output=(
                     "A detailed architecture document in markdown format with diagrams "
                     "described in ASCII art or mermaid syntax."
-                ),
-                agent=self.agent
+                )
             ),
-            Task(
-                description=f"""
-                Based on the architecture for {project_name}, create detailed
-                API specifications including:
-
-                1. RESTful endpoint definitions
-                2. Request/Response schemas
-                3. Authentication/Authorization flows
-                4. Rate limiting strategy
-                5. Error handling patterns
-                """,
+            TaskSpec(
+                description=_API_SPEC_TMPL.substitute(project_name=context.project_name),
                 expected_output=(
                     "OpenAPI 3.0 specification in YAML format with all endpoints, "
                     "schemas, and security definitions."
                 ),
-                agent=self.agent
+                # Builds on the architecture document
+                uses_previous_output=True
             )
         ]
 
@@ -96,6 +189,8 @@ class BackendDeveloperAgent(BaseAgent):
     Responsible for implementing server-side logic, APIs, and database operations.
     """
 
+    batch_tasks = True
+
     def __init__(self):
         config = AgentConfig(
             role=AgentRole.BACKEND_DEVELOPER,
@@ -110,59 +205,35 @@ class BackendDeveloperAgent(BaseAgent):
                 "include comprehensive error handling and logging."
             ),
             tools=[
-                FileReadTool(),
-                DirectoryReadTool(),
-                CodeInterpreterTool(),
+                FILE_READ,
+                DIR_READ,
+                CODE_INTERPRETER,
             ]
         )
         super().__init__(config)
 
-    def get_tasks(self, context: Dict[str, Any]) -> List[Task]:
+    def get_task_specs(self, context: ProjectContext) -> List[TaskSpec]:
         """Generate backend development tasks."""
-        project_name = context.get("project_name", "Unknown Project")
-        architecture = context.get("architecture", {})
-        api_spec = context.get("api_spec", {})
-
         tasks = [
-            Task(
-                description=f"""
-                Implement the database models for {project_name} based on the
-                architecture specification:
-
-                Architecture: {architecture}
-
-                Requirements:
-                1. Use SQLAlchemy 2.0 with async support
-                2. Include all necessary relationships
-                3. Add appropriate indexes
-                4. Include created_at, updated_at timestamps
-                5. Implement soft delete where appropriate
-                """,
+            TaskSpec(
+                description=_BACKEND_MODELS_TMPL.substitute(
+                    project_name=context.project_name,
+                    architecture=context.architecture_json
+                ),
                 expected_output=(
                     "Complete SQLAlchemy model definitions in Python with "
                     "all relationships, indexes, and constraints."
-                ),
-                agent=self.agent
+                )
             ),
-            Task(
-                description=f"""
-                Implement the REST API endpoints for {project_name} based on
-                the API specification:
-
-                API Spec: {api_spec}
-
-                Requirements:
-                1. Use FastAPI with async/await
-                2. Include Pydantic schemas for validation
-                3. Implement proper error handling
-                4. Add authentication decorators
-                5. Include OpenAPI documentation
-                """,
+            TaskSpec(
+                description=_BACKEND_API_TMPL.substitute(
+                    project_name=context.project_name,
+                    api_spec=context.api_spec_json
+                ),
                 expected_output=(
                     "Complete FastAPI route implementations with all CRUD "
                     "operations, validation, and documentation."
-                ),
-                agent=self.agent
+                )
             )
         ]
 
@@ -189,58 +260,36 @@ class FrontendDeveloperAgent(BaseAgent):
                 "You use modern CSS with Tailwind and implement responsive designs."
             ),
             tools=[
-                FileReadTool(),
-                DirectoryReadTool(),
+                FILE_READ,
+                DIR_READ,
             ]
         )
         super().__init__(config)
 
-    def get_tasks(self, context: Dict[str, Any]) -> List[Task]:
+    def get_task_specs(self, context: ProjectContext) -> List[TaskSpec]:
         """Generate frontend development tasks."""
-        project_name = context.get("project_name", "Unknown Project")
-        design_spec = context.get("design_spec", {})
-        api_endpoints = context.get("api_endpoints", [])
-
         tasks = [
-            Task(
-                description=f"""
-                Create the component architecture for {project_name}:
-
-                Design Specification: {design_spec}
-
-                Requirements:
-                1. Define component hierarchy
-                2. Plan state management strategy
-                3. Design reusable component library
-                4. Plan routing structure
-                5. Define API integration layer
-                """,
+            TaskSpec(
+                description=_FRONTEND_ARCHITECTURE_TMPL.substitute(
+                    project_name=context.project_name,
+                    design_spec=context.design_spec_json
+                ),
                 expected_output=(
                     "Component architecture document with hierarchy diagram, "
                     "state management plan, and component specifications."
-                ),
-                agent=self.agent
+                )
             ),
-            Task(
-                description=f"""
-                Implement React components for {project_name} based on the
-                component architecture:
-
-                API Endpoints: {api_endpoints}
-
-                Requirements:
-                1. Use TypeScript with strict mode
-                2. Implement with Next.js 14 app router
-                3. Use TanStack Query for data fetching
-                4. Style with Tailwind CSS
-                5. Include loading and error states
-                6. Ensure accessibility compliance
-                """,
+            TaskSpec(
+                description=_FRONTEND_COMPONENTS_TMPL.substitute(
+                    project_name=context.project_name,
+                    api_endpoints=context.api_endpoints_json
+                ),
                 expected_output=(
                     "Complete React/TypeScript component implementations with "
                     "all required functionality and styling."
                 ),
-                agent=self.agent
+                # Builds on the component architecture
+                uses_previous_output=True
             )
         ]
 
@@ -267,52 +316,32 @@ class DatabaseEngineerAgent(BaseAgent):
                 "workloads and implement proper backup and recovery strategies."
             ),
             tools=[
-                FileReadTool(),
+                FILE_READ,
             ]
         )
         super().__init__(config)
 
-    def get_tasks(self, context: Dict[str, Any]) -> List[Task]:
+    def get_task_specs(self, context: ProjectContext) -> List[TaskSpec]:
         """Generate database engineering tasks."""
-        project_name = context.get("project_name", "Unknown Project")
-        data_model = context.get("data_model", {})
-
         tasks = [
-            Task(
-                description=f"""
-                Design the database schema for {project_name}:
-
-                Data Model: {data_model}
-
-                Requirements:
-                1. Define all tables with appropriate data types
-                2. Establish primary and foreign keys
-                3. Design indexes for common queries
-                4. Plan partitioning strategy if needed
-                5. Consider denormalization for read performance
-                6. Include audit columns
-                """,
+            TaskSpec(
+                description=_DATABASE_SCHEMA_TMPL.substitute(
+                    project_name=context.project_name,
+                    data_model=context.data_model_json
+                ),
                 expected_output=(
                     "Complete database schema in SQL DDL format with all "
                     "tables, indexes, constraints, and documentation."
-                ),
-                agent=self.agent
+                )
             ),
-            Task(
-                description=f"""
-                Create Alembic migrations for {project_name}:
-
-                Requirements:
-                1. Initial schema migration
-                2. Seed data migration
-                3. Index creation migration
-                4. Include rollback procedures
-                """,
+            TaskSpec(
+                description=_DATABASE_MIGRATIONS_TMPL.substitute(project_name=context.project_name),
                 expected_output=(
                     "Alembic migration files with upgrade and downgrade "
                     "functions for all schema changes."
                 ),
-                agent=self.agent
+                # Migrates the schema designed by the previous task
+                uses_previous_output=True
             )
         ]
 
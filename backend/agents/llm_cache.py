@@ -0,0 +1,273 @@
+"""
+LLM Response Cache
+Exact and semantic caching of LLM completions backed by Redis.
+"""
+import hashlib
+import struct
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional, Sequence, Union
+import orjson
+import structlog
+
+import litellm
+import redis
+
+from agents.rate_limit import ThrottledLLM
+from core.config import settings
+
+logger = structlog.get_logger(__name__)
+
+EXACT_PREFIX = "llm_cache:exact:"
+SEMANTIC_PREFIX = "llm_cache:sem:"
+SEMANTIC_INDEX = "llm_cache_idx"
+
+Messages = Union[str, List[Dict[str, str]]]
+
+# Project whose calls are running, bound by ProjectCrew. Prompts of different
+# projects share most of their text (the static templates), so semantic hits
+# are only served within one project; without a project the tier is skipped.
+cache_project: ContextVar[Optional[str]] = ContextVar("llm_cache_project", default=None)
+
+
+class CachingLLM(ThrottledLLM):
+    """
+    crewai.LLM whose completions are served from Redis when possible.
+
+    CrewAI sends every agent request through LLM.call (any other llm object
+    is rebuilt into a plain crewai.LLM), so caching has to live here.
+
+    Only deterministic calls (temperature 0 or unset) are cached; replaying
+    a sampled answer would silently change what a non-zero temperature
+    asks for. Calls are looked up first by an exact SHA-256 key over
+    (model, temperature, messages, tools) and then, if enabled, by
+    embedding similarity against earlier prompts of the same project (see
+    cache_project). Calls that may execute tools (available_functions) are
+    never cached. Cache failures never break generation; they are logged
+    and the call falls through to the provider. Cache hits are not counted
+    against the rate limits.
+    """
+
+    def __init__(
+        self,
+        *args: Any,
+        ttl: Optional[int] = None,
+        semantic: Optional[bool] = None,
+        similarity_threshold: Optional[float] = None,
+        client: Optional[redis.Redis] = None,
+        **kwargs: Any
+    ):
+        """
+        Initialize the cached LLM.
+
+        Args:
+            *args: Positional arguments for crewai.LLM
+            ttl: Cache entry lifetime in seconds
+            semantic: Enable the embedding-similarity tier
+            similarity_threshold: Minimum cosine similarity for a semantic hit
+            client: Redis client to use instead of one built from REDIS_URL
+            **kwargs: Keyword arguments for crewai.LLM
+        """
+        super().__init__(*args, **kwargs)
+        self._ttl = ttl or settings.LLM_CACHE_TTL
+        self._semantic = (
+            settings.LLM_SEMANTIC_CACHE_ENABLED if semantic is None else semantic
+        )
+        self._threshold = similarity_threshold or settings.LLM_SEMANTIC_CACHE_THRESHOLD
+        self._redis = client
+        self._index_ready = False
+
+    def call(
+        self,
+        messages: Messages,
+        tools: Optional[List[Dict[str, Any]]] = None,
+        callbacks: Optional[List[Any]] = None,
+        available_functions: Optional[Dict[str, Any]] = None,
+        **kwargs: Any
+    ) -> str:
+        """Complete the messages, serving repeated prompts from cache."""
+        if available_functions or not self._cacheable:
+            return super().call(
+                messages,
+                tools=tools,
+                callbacks=callbacks,
+                available_functions=available_functions,
+                **kwargs
+            )
+
+        messages = self._to_messages(messages)
+        key = self._cache_key(messages, tools)
+
+        project = cache_project.get()
+        cached = self._get_exact(key)
+        if cached is None and self._semantic and project is not None:
+            cached = self._get_semantic(messages, project)
+        if cached is not None:
+            logger.debug("llm_cache_hit", model=self.model)
+            return cached
+
+        response = super().call(messages, tools=tools, callbacks=callbacks, **kwargs)
+        if isinstance(response, str):
+            self._store(key, messages, response, project)
+        return response
+
+    @property
+    def _cacheable(self) -> bool:
+        """Sampled (non-zero temperature) completions are never replayed."""
+        return self.temperature in (None, 0)
+
+    # ------------------------------------------------------------------
+    # Key construction
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _to_messages(messages: Messages) -> List[Dict[str, str]]:
+        if isinstance(messages, str):
+            return [{"role": "user", "content": messages}]
+        return list(messages)
+
+    def _cache_key(
+        self,
+        messages: Sequence[Dict[str, str]],
+        tools: Optional[Sequence[Any]] = None
+    ) -> str:
+        payload = orjson.dumps(
+            {
+                "model": self.model,
+                "temperature": self.temperature,
+                "messages": list(messages),
+                "tools": list(tools or []),
+            },
+            default=str,
+            option=orjson.OPT_SORT_KEYS
+        )
+        return hashlib.sha256(payload).hexdigest()
+
+    @staticmethod
+    def _prompt_text(messages: Sequence[Dict[str, str]]) -> str:
+        return "\n".join(str(message.get("content", "")) for message in messages)
+
+    @property
+    def _semantic_scope(self) -> str:
+        """Semantic entries are partitioned per model and temperature."""
+        return hashlib.sha256(f"{self.model}:{self.temperature}".encode()).hexdigest()[:16]
+
+    @staticmethod
+    def _project_tag(project: str) -> str:
+        """Project as a RediSearch TAG value (hex, so it needs no escaping)."""
+        return hashlib.sha256(project.encode()).hexdigest()[:16]
+
+    # ------------------------------------------------------------------
+    # Backends
+    # ------------------------------------------------------------------
+
+    @property
+    def _client(self) -> redis.Redis:
+        if self._redis is None:
+            self._redis = redis.Redis.from_url(settings.REDIS_URL)
+        return self._redis
+
+    @staticmethod
+    def _embed(text: str) -> List[float]:
+        response = litellm.embedding(
+            model=settings.LLM_CACHE_EMBEDDING_MODEL,
+            input=[text],
+            api_key=settings.OPENAI_API_KEY
+        )
+        return response.data[0]["embedding"]
+
+    @staticmethod
+    def _pack(vector: Sequence[float]) -> bytes:
+        return struct.pack(f"{len(vector)}f", *vector)
+
+    def _index_args(self, dim: int) -> List[Any]:
+        scope = self._semantic_scope
+        return [
+            "FT.CREATE", f"{SEMANTIC_INDEX}:{scope}",
+            "ON", "HASH",
+            "PREFIX", "1", f"{SEMANTIC_PREFIX}{scope}:",
+            "SCHEMA", "project", "TAG",
+            "embedding", "VECTOR", "HNSW", "6",
+            "TYPE", "FLOAT32", "DIM", str(dim), "DISTANCE_METRIC", "COSINE",
+        ]
+
+    def _search_args(self, vector: bytes, project: str) -> List[Any]:
+        return [
+            "FT.SEARCH", f"{SEMANTIC_INDEX}:{self._semantic_scope}",
+            f"(@project:{{{self._project_tag(project)}}})=>[KNN 1 @embedding $vec AS score]",
+            "PARAMS", "2", "vec", vector,
+            "SORTBY", "score",
+            "RETURN", "2", "score", "response",
+            "DIALECT", "2",
+        ]
+
+    def _parse_search(self, reply: Any) -> Optional[str]:
+        """Return the cached response if the nearest neighbour is close enough."""
+        if not reply or reply[0] == 0:
+            return None
+
+        fields = reply[2]
+        values = dict(zip(fields[::2], fields[1::2]))
+        # COSINE distance is 1 - cosine similarity
+        similarity = 1 - float(values[b"score"])
+        if similarity < self._threshold:
+            return None
+        return values[b"response"].decode()
+
+    @staticmethod
+    def _is_index_exists_error(error: Exception) -> bool:
+        return "index already exists" in str(error).lower()
+
+    def _get_exact(self, key: str) -> Optional[str]:
+        try:
+            blob = self._client.get(EXACT_PREFIX + key)
+        except redis.RedisError as e:
+            logger.warning("llm_cache_unavailable", error=str(e))
+            return None
+        return blob.decode() if blob else None
+
+    def _get_semantic(self, messages: Sequence[Dict[str, str]], project: str) -> Optional[str]:
+        try:
+            embedding = self._embed(self._prompt_text(messages))
+            vector = self._pack(embedding)
+            self._ensure_index(len(embedding))
+            reply = self._client.execute_command(*self._search_args(vector, project))
+            return self._parse_search(reply)
+        except Exception as e:
+            logger.warning("llm_semantic_cache_failed", error=str(e))
+            return None
+
+    def _ensure_index(self, dim: int) -> None:
+        if self._index_ready:
+            return
+        try:
+            self._client.execute_command(*self._index_args(dim))
+        except redis.ResponseError as e:
+            if not self._is_index_exists_error(e):
+                raise
+        self._index_ready = True
+
+    def _store(
+        self,
+        key: str,
+        messages: Sequence[Dict[str, str]],
+        response: str,
+        project: Optional[str]
+    ) -> None:
+        try:
+            blob = response.encode()
+            self._client.setex(EXACT_PREFIX + key, self._ttl, blob)
+
+            if self._semantic and project is not None:
+                embedding = self._embed(self._prompt_text(messages))
+                self._ensure_index(len(embedding))
+                entry = f"{SEMANTIC_PREFIX}{self._semantic_scope}:{key}"
+                pipe = self._client.pipeline()
+                pipe.hset(entry, mapping={
+                    "project": self._project_tag(project),
+                    "embedding": self._pack(embedding),
+                    "response": blob,
+                })
+                pipe.expire(entry, self._ttl)
+                pipe.execute()
+        except Exception as e:
+            logger.warning("llm_cache_store_failed", error=str(e))
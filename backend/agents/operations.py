@@ -2,15 +2,181 @@
 Operations Team Agents
 Specialized agents for DevOps, QA, and security tasks.
 """
-from typing import Any, Dict, List
-
-from crewai import Task
-from crewai_tools import (
-    FileReadTool,
-    DirectoryReadTool,
-)
-
-from agents.base import BaseAgent, AgentConfig, AgentRole
+import functools
+from string import Template
+from typing import List
+
+from agents.base import BaseAgent, AgentConfig, AgentRole, ProjectContext, TaskSpec
+from agents.tools import FILE_READ, DIR_READ
+
+# Task prompts keep the static instructions first and append per-project
+# data last, matching the development agents.
+
+_DEVOPS_DOCKER_TMPL = Template("""
+Create Docker configuration for the project below:
+
+Requirements:
+1. Multi-stage Dockerfile for each service
+2. Docker Compose for local development
+3. Optimize image sizes
+4. Include health checks
+5. Configure proper networking
+6. Set up volume mounts for persistence
+
+Project: $project_name
+Architecture: $architecture
+""")
+
+_DEVOPS_CICD_TMPL = Template("""
+Create CI/CD pipeline for the project below:
+
+Requirements:
+1. GitHub Actions workflow
+2. Build and test stages
+3. Security scanning (SAST/DAST)
+4. Container image building and pushing
+5. Deployment to staging and production
+6. Rollback procedures
+
+Project: $project_name
+""")
+
+_DEVOPS_IAC_TMPL = Template("""
+Create infrastructure as code for the project below:
+
+Requirements:
+1. Terraform modules for cloud resources
+2. Kubernetes manifests or Helm charts
+3. Network security groups
+4. Load balancer configuration
+5. Auto-scaling policies
+6. Monitoring and alerting setup
+
+Project: $project_name
+""")
+
+_QA_STRATEGY_TMPL = Template("""
+Create test strategy for the project below:
+
+Include:
+1. Test pyramid structure
+2. Coverage targets for each layer
+3. Test environment requirements
+4. Data management strategy
+5. Performance testing approach
+6. Security testing scope
+
+Project: $project_name
+Requirements: $requirements
+""")
+
+_QA_BACKEND_TMPL = Template("""
+Implement backend test suite for the project below:
+
+Requirements:
+1. Unit tests with pytest
+2. Integration tests for API endpoints
+3. Database tests with test fixtures
+4. Mock external dependencies
+5. Achieve 80%+ code coverage
+6. Include performance benchmarks
+
+Project: $project_name
+""")
+
+_QA_FRONTEND_TMPL = Template("""
+Implement frontend test suite for the project below:
+
+Requirements:
+1. Component tests with Jest/React Testing Library
+2. E2E tests with Playwright
+3. Visual regression tests
+4. Accessibility tests
+5. Performance budgets
+
+Project: $project_name
+""")
+
+_SECURITY_THREAT_MODEL_TMPL = Template("""
+Perform threat modeling for the project below:
+
+Requirements:
+1. Identify trust boundaries
+2. Apply STRIDE methodology
+3. Document threat scenarios
+4. Prioritize by risk level
+5. Recommend mitigations
+
+Project: $project_name
+Architecture: $architecture
+""")
+
+_SECURITY_REQUIREMENTS_TMPL = Template("""
+Define security requirements for the project below:
+
+Requirements:
+1. Authentication mechanisms (OAuth2/OIDC)
+2. Authorization model (RBAC/ABAC)
+3. Data encryption (at rest and in transit)
+4. Input validation rules
+5. Audit logging requirements
+6. Compliance controls (GDPR, SOC2)
+
+Project: $project_name
+""")
+
+_SECURITY_TESTING_TMPL = Template("""
+Create security testing plan for the project below:
+
+Requirements:
+1. SAST tool configuration
+2. DAST scanning scope
+3. Dependency vulnerability scanning
+4. Penetration testing scope
+5. Security regression tests
+
+Project: $project_name
+""")
+
+_WRITER_API_DOCS_TMPL = Template("""
+Create API documentation for the project below:
+
+Requirements:
+1. Getting started guide
+2. Authentication guide
+3. Endpoint reference with examples
+4. Error code reference
+5. Rate limiting documentation
+6. SDK examples (curl, Python, JavaScript)
+
+Project: $project_name
+API Specification: $api_spec
+""")
+
+_WRITER_DEV_DOCS_TMPL = Template("""
+Create developer documentation for the project below:
+
+Requirements:
+1. Local development setup
+2. Architecture overview
+3. Code contribution guidelines
+4. Testing guide
+5. Deployment guide
+6. Troubleshooting guide
+
+Project: $project_name
+""")
+
+
+@functools.lru_cache(maxsize=256)
+def _render(template: Template, context: ProjectContext) -> str:
+    """Render a task prompt; contexts are frozen, so results are memoized."""
+    return template.substitute(
+        project_name=context.project_name,
+        requirements=context.requirements_json,
+        architecture=context.architecture_json,
+        api_spec=context.api_spec_json,
+    )
 
 
 class DevOpsEngineerAgent(BaseAgent):
@@ -34,73 +200,35 @@ class DevOpsEngineerAgent(BaseAgent):
                 "and implement comprehensive monitoring."
             ),
             tools=[
-                FileReadTool(),
-                DirectoryReadTool(),
+                FILE_READ,
+                DIR_READ,
             ]
         )
         super().__init__(config)
 
-    def get_tasks(self, context: Dict[str, Any]) -> List[Task]:
+    def get_task_specs(self, context: ProjectContext) -> List[TaskSpec]:
         """Generate DevOps tasks."""
-        project_name = context.get("project_name", "Unknown Project")
-        architecture = context.get("architecture", {})
-
         tasks = [
-            Task(
-                description=f"""
-                Create Docker configuration for {project_name}:
-
-                Architecture: {architecture}
-
-                Requirements:
-                1. Multi-stage Dockerfile for each service
-                2. Docker Compose for local development
-                3. Optimize image sizes
-                4. Include health checks
-                5. Configure proper networking
-                6. Set up volume mounts for persistence
-                """,
+            TaskSpec(
+                description=_render(_DEVOPS_DOCKER_TMPL, context),
                 expected_output=(
                     "Complete Dockerfile and docker-compose.yml with all "
                     "services, networks, and volumes configured."
-                ),
-                agent=self.agent
+                )
             ),
-            Task(
-                description=f"""
-                Create CI/CD pipeline for {project_name}:
-
-                Requirements:
-                1. GitHub Actions workflow
-                2. Build and test stages
-                3. Security scanning (SAST/DAST)
-                4. Container image building and pushing
-                5. Deployment to staging and production
-                6. Rollback procedures
-                """,
+            TaskSpec(
+                description=_render(_DEVOPS_CICD_TMPL, context),
                 expected_output=(
                     "Complete GitHub Actions workflow files with all stages, "
                     "secrets management, and environment configurations."
-                ),
-                agent=self.agent
+                )
             ),
-            Task(
-                description=f"""
-                Create infrastructure as code for {project_name}:
-
-                Requirements:
-                1. Terraform modules for cloud resources
-                2. Kubernetes manifests or Helm charts
-                3. Network security groups
-                4. Load balancer configuration
-                5. Auto-scaling policies
-                6. Monitoring and alerting setup
-                """,
+            TaskSpec(
+                description=_render(_DEVOPS_IAC_TMPL, context),
                 expected_output=(
                     "Complete Terraform configurations and Kubernetes manifests "
                     "for production deployment."
-                ),
-                agent=self.agent
+                )
             )
         ]
 
@@ -127,72 +255,35 @@ class QAEngineerAgent(BaseAgent):
                 "for frontend, and implement quality gates in CI/CD pipelines."
             ),
             tools=[
-                FileReadTool(),
-                DirectoryReadTool(),
+                FILE_READ,
+                DIR_READ,
             ]
         )
         super().__init__(config)
 
-    def get_tasks(self, context: Dict[str, Any]) -> List[Task]:
+    def get_task_specs(self, context: ProjectContext) -> List[TaskSpec]:
         """Generate QA tasks."""
-        project_name = context.get("project_name", "Unknown Project")
-        requirements = context.get("requirements", {})
-
         tasks = [
-            Task(
-                description=f"""
-                Create test strategy for {project_name}:
-
-                Requirements: {requirements}
-
-                Include:
-                1. Test pyramid structure
-                2. Coverage targets for each layer
-                3. Test environment requirements
-                4. Data management strategy
-                5. Performance testing approach
-                6. Security testing scope
-                """,
+            TaskSpec(
+                description=_render(_QA_STRATEGY_TMPL, context),
                 expected_output=(
                     "Comprehensive test strategy document with detailed "
                     "approach for each testing layer."
-                ),
-                agent=self.agent
+                )
             ),
-            Task(
-                description=f"""
-                Implement backend test suite for {project_name}:
-
-                Requirements:
-                1. Unit tests with pytest
-                2. Integration tests for API endpoints
-                3. Database tests with test fixtures
-                4. Mock external dependencies
-                5. Achieve 80%+ code coverage
-                6. Include performance benchmarks
-                """,
+            TaskSpec(
+                description=_render(_QA_BACKEND_TMPL, context),
                 expected_output=(
                     "Complete pytest test suite with fixtures, mocks, "
                     "and configuration for CI integration."
-                ),
-                agent=self.agent
+                )
             ),
-            Task(
-                description=f"""
-                Implement frontend test suite for {project_name}:
-
-                Requirements:
-                1. Component tests with Jest/React Testing Library
-                2. E2E tests with Playwright
-                3. Visual regression tests
-                4. Accessibility tests
-                5. Performance budgets
-                """,
+            TaskSpec(
+                description=_render(_QA_FRONTEND_TMPL, context),
                 expected_output=(
                     "Complete frontend test suite with component tests, "
                     "E2E scenarios, and CI configuration."
-                ),
-                agent=self.agent
+                )
             )
         ]
 
@@ -220,71 +311,35 @@ class SecurityAnalystAgent(BaseAgent):
                 "and data protection."
             ),
             tools=[
-                FileReadTool(),
-                DirectoryReadTool(),
+                FILE_READ,
+                DIR_READ,
             ]
         )
         super().__init__(config)
 
-    def get_tasks(self, context: Dict[str, Any]) -> List[Task]:
+    def get_task_specs(self, context: ProjectContext) -> List[TaskSpec]:
         """Generate security tasks."""
-        project_name = context.get("project_name", "Unknown Project")
-        architecture = context.get("architecture", {})
-
         tasks = [
-            Task(
-                description=f"""
-                Perform threat modeling for {project_name}:
-
-                Architecture: {architecture}
-
-                Requirements:
-                1. Identify trust boundaries
-                2. Apply STRIDE methodology
-                3. Document threat scenarios
-                4. Prioritize by risk level
-                5. Recommend mitigations
-                """,
+            TaskSpec(
+                description=_render(_SECURITY_THREAT_MODEL_TMPL, context),
                 expected_output=(
                     "Threat model document with identified threats, "
                     "risk ratings, and mitigation strategies."
-                ),
-                agent=self.agent
+                )
             ),
-            Task(
-                description=f"""
-                Define security requirements for {project_name}:
-
-                Requirements:
-                1. Authentication mechanisms (OAuth2/OIDC)
-                2. Authorization model (RBAC/ABAC)
-                3. Data encryption (at rest and in transit)
-                4. Input validation rules
-                5. Audit logging requirements
-                6. Compliance controls (GDPR, SOC2)
-                """,
+            TaskSpec(
+                description=_render(_SECURITY_REQUIREMENTS_TMPL, context),
                 expected_output=(
                     "Security requirements specification with implementation "
                     "guidance for each control."
-                ),
-                agent=self.agent
+                )
             ),
-            Task(
-                description=f"""
-                Create security testing plan for {project_name}:
-
-                Requirements:
-                1. SAST tool configuration
-                2. DAST scanning scope
-                3. Dependency vulnerability scanning
-                4. Penetration testing scope
-                5. Security regression tests
-                """,
+            TaskSpec(
+                description=_render(_SECURITY_TESTING_TMPL, context),
                 expected_output=(
                     "Security testing plan with tool configurations, "
                     "test cases, and CI integration."
-                ),
-                agent=self.agent
+                )
             )
         ]
 
@@ -311,55 +366,28 @@ class TechnicalWriterAgent(BaseAgent):
                 "practices and ensure documentation stays in sync with code."
             ),
             tools=[
-                FileReadTool(),
-                DirectoryReadTool(),
+                FILE_READ,
+                DIR_READ,
             ]
         )
         super().__init__(config)
 
-    def get_tasks(self, context: Dict[str, Any]) -> List[Task]:
+    def get_task_specs(self, context: ProjectContext) -> List[TaskSpec]:
         """Generate documentation tasks."""
-        project_name = context.get("project_name", "Unknown Project")
-        api_spec = context.get("api_spec", {})
-
         tasks = [
-            Task(
-                description=f"""
-                Create API documentation for {project_name}:
-
-                API Specification: {api_spec}
-
-                Requirements:
-                1. Getting started guide
-                2. Authentication guide
-                3. Endpoint reference with examples
-                4. Error code reference
-                5. Rate limiting documentation
-                6. SDK examples (curl, Python, JavaScript)
-                """,
+            TaskSpec(
+                description=_render(_WRITER_API_DOCS_TMPL, context),
                 expected_output=(
                     "Complete API documentation in markdown format with "
                     "examples, diagrams, and code samples."
-                ),
-                agent=self.agent
+                )
             ),
-            Task(
-                description=f"""
-                Create developer documentation for {project_name}:
-
-                Requirements:
-                1. Local development setup
-                2. Architecture overview
-                3. Code contribution guidelines
-                4. Testing guide
-                5. Deployment guide
-                6. Troubleshooting guide
-                """,
+            TaskSpec(
+                description=_render(_WRITER_DEV_DOCS_TMPL, context),
                 expected_output=(
                     "Complete developer documentation enabling new "
                     "developers to contribute to the project."
-                ),
-                agent=self.agent
+                )
             )
         ]
 
@@ -0,0 +1,145 @@
+"""
+Rate Limiting
+Token-bucket throttling and retry policy for provider RPM/TPM limits.
+"""
+import asyncio
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Union
+import orjson
+import structlog
+
+import litellm
+from crewai import LLM
+from tenacity import (
+    RetryCallState,
+    retry,
+    retry_if_exception_type,
+    stop_after_attempt,
+    wait_exponential,
+)
+
+from core.config import settings
+
+logger = structlog.get_logger(__name__)
+
+# Rough prompt size estimate used when charging the token bucket
+CHARS_PER_TOKEN = 4
+
+# CrewAI calls providers through litellm, which raises its own exception types
+RETRYABLE_ERRORS = (
+    litellm.RateLimitError,
+    litellm.Timeout,
+)
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket.
+
+    A threading lock is used rather than an asyncio one because CrewAI runs
+    agents in worker threads, each with its own event loop or none at all;
+    the same bucket has to be shared across all of them.
+    """
+
+    def __init__(
+        self,
+        rate_per_sec: float,
+        burst: float,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+        async_sleep: Callable[[float], Awaitable[None]] = asyncio.sleep
+    ):
+        """
+        Initialize the bucket.
+
+        Args:
+            rate_per_sec: Refill rate in tokens per second
+            burst: Bucket capacity
+            clock: Monotonic time source in seconds
+            sleep: Blocking sleep used by acquire_sync()
+            async_sleep: Coroutine sleep used by acquire()
+        """
+        self.rate = rate_per_sec
+        self.capacity = burst
+        self._clock = clock
+        self._sleep = sleep
+        self._async_sleep = async_sleep
+        self._tokens = burst
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def _reserve(self, amount: float) -> float:
+        """Take amount tokens and return how long to wait until they are available."""
+        amount = min(amount, self.capacity)
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= amount
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    def acquire_sync(self, amount: float = 1) -> None:
+        """Block the calling thread until amount tokens are available."""
+        delay = self._reserve(amount)
+        if delay:
+            self._sleep(delay)
+
+    async def acquire(self, amount: float = 1) -> None:
+        """Wait until amount tokens are available."""
+        delay = self._reserve(amount)
+        if delay:
+            await self._async_sleep(delay)
+
+
+def _per_minute(limit: int) -> Optional[TokenBucket]:
+    return TokenBucket(limit / 60, limit) if limit > 0 else None
+
+
+# Shared by every LLM client in the process
+request_bucket = _per_minute(settings.LLM_RPM)
+token_bucket = _per_minute(settings.LLM_TPM)
+
+
+def _log_retry(retry_state: RetryCallState) -> None:
+    logger.warning(
+        "llm_rate_limited",
+        attempt=retry_state.attempt_number,
+        error=str(retry_state.outcome.exception())
+    )
+
+
+# Retry rate-limited or timed-out requests with exponential backoff
+llm_retry = retry(
+    stop=stop_after_attempt(3),
+    wait=wait_exponential(multiplier=1, max=30),
+    retry=retry_if_exception_type(RETRYABLE_ERRORS),
+    before_sleep=_log_retry,
+    reraise=True
+)
+
+
+def _estimate_tokens(messages: Union[str, List[Dict[str, str]]]) -> int:
+    text = messages if isinstance(messages, str) else orjson.dumps(messages, default=str)
+    return max(1, len(text) // CHARS_PER_TOKEN)
+
+
+class ThrottledLLM(LLM):
+    """
+    crewai.LLM that waits on the shared buckets before each request.
+
+    CrewAI sends every agent request through LLM.call, so this is where the
+    process-wide LLM_RPM/LLM_TPM limits are enforced. Requests failing on a
+    provider rate limit or timeout are retried individually with backoff.
+    """
+
+    @llm_retry
+    def call(self, messages: Union[str, List[Dict[str, str]]], *args: Any, **kwargs: Any) -> Any:
+        """Throttle, then complete the messages."""
+        if request_bucket is not None:
+            request_bucket.acquire_sync()
+        if token_bucket is not None:
+            token_bucket.acquire_sync(_estimate_tokens(messages))
+        return super().call(messages, *args, **kwargs)
@@ -0,0 +1,126 @@
+"""
+Task Result Cache
+Persists agent task outputs and submitted batches in SQLite.
+"""
+import sqlite3
+import threading
+from contextlib import closing
+from typing import Any, Dict, Iterable, List, Optional
+import orjson
+
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS task_results ("
+    " key TEXT PRIMARY KEY, output TEXT NOT NULL)",
+    "CREATE TABLE IF NOT EXISTS pending_batches ("
+    " project TEXT NOT NULL, phase TEXT NOT NULL, batch BLOB NOT NULL,"
+    " PRIMARY KEY (project, phase))",
+)
+
+# Stay well below SQLite's limit on bound parameters per statement
+_MAX_PARAMS = 500
+
+
+class TaskCache:
+    """
+    Task outputs keyed by task_key(), and the batches submitted per project.
+
+    SQLite locks the file around writes, so threads, uvicorn workers and
+    parallel pipelines can share one cache file. Every method opens a
+    short-lived connection and blocks; call them off the event loop (e.g.
+    through run_blocking).
+    """
+
+    def __init__(self, path: str, timeout: float = 30.0):
+        """
+        Initialize the cache.
+
+        Args:
+            path: SQLite database file, created on first use
+            timeout: Seconds to wait for another writer's lock
+        """
+        self.path = path
+        self.timeout = timeout
+        self._schema_ready = False
+        self._schema_lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=self.timeout)
+        if not self._schema_ready:
+            with self._schema_lock:
+                if not self._schema_ready:
+                    # WAL lets readers proceed while another process writes
+                    conn.execute("PRAGMA journal_mode=WAL")
+                    for statement in _SCHEMA:
+                        conn.execute(statement)
+                    conn.commit()
+                    self._schema_ready = True
+        return conn
+
+    def get_outputs(self, keys: Iterable[str]) -> Dict[str, str]:
+        """
+        Look up stored task outputs.
+
+        Args:
+            keys: Task keys to look up
+
+        Returns:
+            Outputs of the keys that are stored
+        """
+        unique: List[str] = list(dict.fromkeys(keys))
+        found: Dict[str, str] = {}
+        if not unique:
+            return found
+
+        with closing(self._connect()) as conn:
+            for start in range(0, len(unique), _MAX_PARAMS):
+                chunk = unique[start:start + _MAX_PARAMS]
+                rows = conn.execute(
+                    "SELECT key, output FROM task_results"
+                    f" WHERE key IN ({', '.join('?' * len(chunk))})",
+                    chunk
+                )
+                found.update(rows)
+        return found
+
+    def put_outputs(self, outputs: Dict[str, str]) -> None:
+        """Store task outputs, replacing earlier outputs of the same keys."""
+        if not outputs:
+            return
+
+        with closing(self._connect()) as conn, conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO task_results (key, output) VALUES (?, ?)",
+                outputs.items()
+            )
+
+    def get_batches(self, project: str) -> Dict[str, Dict[str, Any]]:
+        """
+        Get the batches submitted for a project and not yet collected.
+
+        Args:
+            project: Project key
+
+        Returns:
+            Batch records keyed by phase value
+        """
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                "SELECT phase, batch FROM pending_batches WHERE project = ?",
+                (project,)
+            )
+            return {phase: orjson.loads(batch) for phase, batch in rows}
+
+    def set_batch(self, project: str, phase: str, batch: Optional[Dict[str, Any]]) -> None:
+        """Record (or with None, forget) the submitted batch of a project phase."""
+        with closing(self._connect()) as conn, conn:
+            if batch is None:
+                conn.execute(
+                    "DELETE FROM pending_batches WHERE project = ? AND phase = ?",
+                    (project, phase)
+                )
+            else:
+                conn.execute(
+                    "INSERT OR REPLACE INTO pending_batches (project, phase, batch)"
+                    " VALUES (?, ?, ?)",
+                    (project, phase, orjson.dumps(batch))
+                )
@@ -0,0 +1,14 @@
+"""
+Shared Agent Tools
+Tool instances reused by every agent.
+"""
+from crewai_tools import (
+    FileReadTool,
+    DirectoryReadTool,
+    CodeInterpreterTool,
+)
+
+# Tools keep no per-run state, so one instance of each serves all agents
+FILE_READ = FileReadTool()
+DIR_READ = DirectoryReadTool()
+CODE_INTERPRETER = CodeInterpreterTool()
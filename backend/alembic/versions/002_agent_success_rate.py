@@ -0,0 +1,36 @@
+"""Store agent success rate as a generated column
+
+Revision ID: 002
+Revises: 001
+Create Date: 2024-01-15 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = '002'
+down_revision: Union[str, None] = '001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        'agents',
+        sa.Column(
+            'success_rate',
+            sa.Numeric(5, 2),
+            sa.Computed(
+                'CASE WHEN total_tasks > 0 '
+                'THEN round(completed_tasks::numeric * 100 / total_tasks, 2) '
+                'ELSE 0 END',
+                persisted=True
+            )
+        )
+    )
+
+
+def downgrade() -> None:
+    op.drop_column('agents', 'success_rate')
@@ -0,0 +1,49 @@
+"""Store JSON columns as JSONB
+
+Revision ID: 003
+Revises: 002
+Create Date: 2024-01-22 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision: str = '003'
+down_revision: Union[str, None] = '002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+JSON_COLUMNS = {
+    'projects': ('requirements', 'user_stories', 'tech_stack', 'architecture'),
+    'agents': ('skills', 'tools'),
+    'tasks': ('depends_on', 'result'),
+    'messages': ('attachments',),
+    'memories': ('metadata',),
+}
+
+
+def upgrade() -> None:
+    for table, columns in JSON_COLUMNS.items():
+        for column in columns:
+            op.alter_column(
+                table,
+                column,
+                type_=postgresql.JSONB(),
+                existing_type=postgresql.JSON(astext_type=sa.Text()),
+                postgresql_using=f'"{column}"::jsonb'
+            )
+
+
+def downgrade() -> None:
+    for table, columns in JSON_COLUMNS.items():
+        for column in columns:
+            op.alter_column(
+                table,
+                column,
+                type_=postgresql.JSON(astext_type=sa.Text()),
+                existing_type=postgresql.JSONB(),
+                postgresql_using=f'"{column}"::json'
+            )
@@ -0,0 +1,127 @@
+"""Add cursor, covering, partial and GIN indexes for list and stats queries
+
+Revision ID: 004
+Revises: 003
+Create Date: 2024-01-29 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = '004'
+down_revision: Union[str, None] = '003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+GIN_COLUMNS = ('requirements', 'tech_stack', 'architecture')
+
+
+def upgrade() -> None:
+    # CONCURRENTLY avoids locking writes, but cannot run inside a transaction
+    with op.get_context().autocommit_block():
+        # Keyset pagination cursors for list_projects and list_agents
+        op.create_index(
+            'ix_projects_created_at_id', 'projects', ['created_at', 'id'],
+            postgresql_concurrently=True
+        )
+        op.create_index(
+            'ix_agents_name_id', 'agents', ['name', 'id'],
+            postgresql_concurrently=True
+        )
+
+        # jsonb_path_ops indexes only support containment (@>) but are much smaller
+        for column in GIN_COLUMNS:
+            op.create_index(
+                f'ix_projects_{column}_gin',
+                'projects',
+                [column],
+                postgresql_using='gin',
+                postgresql_ops={column: 'jsonb_path_ops'},
+                postgresql_concurrently=True
+            )
+
+        # Status-filtered listing walks the index in cursor order; INCLUDE
+        # covers the rest of the list projection for index-only scans
+        op.create_index(
+            'ix_agents_status_name',
+            'agents',
+            ['status', 'name', 'id'],
+            postgresql_include=[
+                'agent_id', 'role', 'total_tasks', 'completed_tasks',
+                'failed_tasks', 'created_at'
+            ],
+            postgresql_concurrently=True
+        )
+
+        # Leading project_id also serves plain per-project lookups
+        op.create_index(
+            'ix_tasks_project_status', 'tasks', ['project_id', 'status'],
+            postgresql_concurrently=True
+        )
+        # Per-agent task windows for the agent stats endpoint
+        op.create_index(
+            'ix_tasks_assigned_created', 'tasks', ['assigned_to', 'created_at'],
+            postgresql_concurrently=True
+        )
+        op.create_index(
+            'ix_tasks_active',
+            'tasks',
+            ['project_id'],
+            postgresql_where=sa.text("status IN ('pending', 'in_progress')"),
+            postgresql_concurrently=True
+        )
+
+        op.create_index(
+            'ix_messages_project_created',
+            'messages',
+            ['project_id', sa.text('created_at DESC')],
+            postgresql_concurrently=True
+        )
+
+        # Superseded by the composite indexes above
+        for name, table in (
+            ('ix_projects_created_at', 'projects'),
+            ('ix_agents_status', 'agents'),
+            ('ix_tasks_project_id', 'tasks'),
+            ('ix_tasks_status', 'tasks'),
+            ('ix_messages_project_id', 'messages'),
+        ):
+            op.drop_index(name, table, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_projects_created_at', 'projects', ['created_at'],
+            postgresql_concurrently=True
+        )
+        op.create_index(
+            'ix_agents_status', 'agents', ['status'],
+            postgresql_concurrently=True
+        )
+        op.create_index(
+            'ix_tasks_project_id', 'tasks', ['project_id'],
+            postgresql_concurrently=True
+        )
+        op.create_index(
+            'ix_tasks_status', 'tasks', ['status'],
+            postgresql_concurrently=True
+        )
+        op.create_index(
+            'ix_messages_project_id', 'messages', ['project_id'],
+            postgresql_concurrently=True
+        )
+
+        for name, table in (
+            ('ix_messages_project_created', 'messages'),
+            ('ix_tasks_active', 'tasks'),
+            ('ix_tasks_assigned_created', 'tasks'),
+            ('ix_tasks_project_status', 'tasks'),
+            ('ix_agents_status_name', 'agents'),
+            *((f'ix_projects_{column}_gin', 'projects') for column in GIN_COLUMNS),
+            ('ix_agents_name_id', 'agents'),
+            ('ix_projects_created_at_id', 'projects'),
+        ):
+            op.drop_index(name, table, postgresql_concurrently=True)
@@ -0,0 +1,58 @@
+"""Store masked API key hints
+
+Revision ID: 005
+Revises: 004
+Create Date: 2024-02-01 00:00:00.000000
+
+"""
+import base64
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from cryptography.fernet import Fernet
+
+from core.config import settings
+
+revision: str = '005'
+down_revision: Union[str, None] = '004'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _mask(key: str) -> str:
+    # Mirrors api.settings.mask_api_key at the time of this revision
+    if len(key) <= 8:
+        return "****"
+    return f"{key[:4]}...{key[-4:]}"
+
+
+def upgrade() -> None:
+    op.add_column('api_keys', sa.Column('api_key_masked', sa.String(16), nullable=True))
+
+    # One-time decrypt of existing keys to compute their hints
+    cipher = Fernet(base64.urlsafe_b64encode(settings.SECRET_KEY.encode()[:32].ljust(32, b'0')))
+    api_keys = sa.table(
+        'api_keys',
+        sa.column('id', sa.Integer),
+        sa.column('api_key', sa.String),
+        sa.column('api_key_masked', sa.String),
+    )
+
+    conn = op.get_bind()
+    for row in conn.execute(sa.select(api_keys.c.id, api_keys.c.api_key)):
+        try:
+            masked = _mask(cipher.decrypt(row.api_key.encode()).decode())
+        except Exception:
+            masked = "****"
+        conn.execute(
+            api_keys.update()
+            .where(api_keys.c.id == row.id)
+            .values(api_key_masked=masked)
+        )
+
+    op.alter_column('api_keys', 'api_key_masked', nullable=False)
+
+
+def downgrade() -> None:
+    op.drop_column('api_keys', 'api_key_masked')
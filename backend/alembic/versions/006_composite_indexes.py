@@ -0,0 +1,40 @@
+"""Add composite indexes for message and memory lookups
+
+Revision ID: 006
+Revises: 005
+Create Date: 2024-02-08 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+revision: str = '006'
+down_revision: Union[str, None] = '005'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # CONCURRENTLY avoids locking writes, but cannot run inside a transaction
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_messages_project_read',
+            'messages',
+            ['project_id', 'read'],
+            postgresql_concurrently=True,
+            if_not_exists=True
+        )
+        op.create_index(
+            'ix_memories_agent_type',
+            'memories',
+            ['agent_id', 'memory_type'],
+            postgresql_concurrently=True,
+            if_not_exists=True
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_memories_agent_type', 'memories', postgresql_concurrently=True)
+        op.drop_index('ix_messages_project_read', 'messages', postgresql_concurrently=True)
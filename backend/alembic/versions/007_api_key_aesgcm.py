@@ -0,0 +1,98 @@
+"""Store API keys as AES-GCM ciphertext
+
+Revision ID: 007
+Revises: 006
+Create Date: 2024-02-15 00:00:00.000000
+
+"""
+import base64
+import os
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from cryptography.fernet import Fernet, InvalidToken
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+from cryptography.hazmat.primitives.kdf.hkdf import HKDF
+
+from core.config import settings
+
+revision: str = '007'
+down_revision: Union[str, None] = '006'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Key derivations as used by api.settings before and after this revision
+_FERNET_KEY = base64.urlsafe_b64encode(settings.SECRET_KEY.encode()[:32].ljust(32, b'0'))
+_AES_KEY = HKDF(
+    algorithm=hashes.SHA256(),
+    length=32,
+    salt=None,
+    info=b"ai-software-factory:api-keys"
+).derive(settings.SECRET_KEY.encode())
+
+api_keys = sa.table(
+    'api_keys',
+    sa.column('id', sa.Integer),
+    sa.column('api_key', sa.String),
+    sa.column('api_key_ct', sa.LargeBinary),
+    sa.column('nonce', sa.LargeBinary),
+)
+
+
+def upgrade() -> None:
+    op.add_column('api_keys', sa.Column('api_key_ct', sa.LargeBinary(), nullable=True))
+    op.add_column('api_keys', sa.Column('nonce', sa.LargeBinary(12), nullable=True))
+
+    fernet = Fernet(_FERNET_KEY)
+    aesgcm = AESGCM(_AES_KEY)
+
+    conn = op.get_bind()
+    undecryptable = []
+    for row in conn.execute(sa.select(api_keys.c.id, api_keys.c.api_key)).all():
+        try:
+            plaintext = fernet.decrypt(row.api_key.encode())
+        except InvalidToken:
+            undecryptable.append(row.id)
+            continue
+        nonce = os.urandom(12)
+        conn.execute(
+            api_keys.update()
+            .where(api_keys.c.id == row.id)
+            .values(api_key_ct=aesgcm.encrypt(nonce, plaintext, None), nonce=nonce)
+        )
+
+    # Usually a SECRET_KEY other than the one the keys were stored with.
+    # Nothing is deleted: the transaction rolls back and the rows stay intact.
+    if undecryptable:
+        raise RuntimeError(
+            f"api_keys rows {undecryptable} cannot be decrypted with the current "
+            "SECRET_KEY. Run the migration with the SECRET_KEY they were stored "
+            "with, or delete those rows explicitly before upgrading."
+        )
+
+    op.drop_column('api_keys', 'api_key')
+    op.alter_column('api_keys', 'api_key_ct', new_column_name='api_key', nullable=False)
+    op.alter_column('api_keys', 'nonce', nullable=False)
+
+
+def downgrade() -> None:
+    op.alter_column('api_keys', 'api_key', new_column_name='api_key_ct')
+    op.add_column('api_keys', sa.Column('api_key', sa.String(500), nullable=True))
+
+    fernet = Fernet(_FERNET_KEY)
+    aesgcm = AESGCM(_AES_KEY)
+
+    conn = op.get_bind()
+    for row in conn.execute(sa.select(api_keys.c.id, api_keys.c.api_key_ct, api_keys.c.nonce)).all():
+        plaintext = aesgcm.decrypt(row.nonce, row.api_key_ct, None)
+        conn.execute(
+            api_keys.update()
+            .where(api_keys.c.id == row.id)
+            .values(api_key=fernet.encrypt(plaintext).decode())
+        )
+
+    op.drop_column('api_keys', 'nonce')
+    op.drop_column('api_keys', 'api_key_ct')
+    op.alter_column('api_keys', 'api_key', nullable=False)
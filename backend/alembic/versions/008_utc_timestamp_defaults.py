@@ -0,0 +1,42 @@
+"""Fill timestamp defaults with UTC
+
+Revision ID: 008
+Revises: 007
+Create Date: 2024-02-22 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+revision: str = '008'
+down_revision: Union[str, None] = '007'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Columns the database now fills (the app used to send datetime.utcnow())
+TIMESTAMP_COLUMNS = {
+    'projects': ('created_at', 'updated_at'),
+    'agents': ('created_at', 'updated_at'),
+    'tasks': ('created_at', 'updated_at'),
+    'messages': ('created_at',),
+    'api_keys': ('created_at', 'updated_at'),
+    'memories': ('created_at', 'accessed_at'),
+}
+
+
+def _set_defaults(default: str) -> None:
+    for table, columns in TIMESTAMP_COLUMNS.items():
+        for column in columns:
+            op.alter_column(table, column, server_default=sa.text(default))
+
+
+def upgrade() -> None:
+    # The columns are timestamp without time zone, so now() would store the
+    # session time zone's local time
+    _set_defaults("timezone('utc', now())")
+
+
+def downgrade() -> None:
+    _set_defaults('now()')
@@ -1,21 +1,34 @@
 """
 Agents API Endpoints
 """
-from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import Any, Dict, List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from pydantic import BaseModel
-from datetime import datetime
+from sqlalchemy import func, select, tuple_
+from pydantic import BaseModel, ConfigDict
+from datetime import datetime, timedelta
 
+from api.pagination import keyset_page, next_page_link, require_complete_cursor
+from api.streaming import json_array_response
 from database.session import get_db
-from database.models import Agent, AgentStatus
+from database.models import Agent, AgentStatus, Task, utc_now
+from utils.cache import TTLCache
 
 router = APIRouter()
 
+# Agent rows change rarely; dashboards poll these endpoints constantly.
+# Nothing invalidates entries: status and task counters may lag by up to ttl.
+_agent_cache = TTLCache(maxsize=1024, ttl=5)
+
+# Window reported in the stats endpoint's recent_tasks block
+RECENT_WINDOW = timedelta(days=1)
+
 
 class AgentResponse(BaseModel):
     """Agent response schema"""
+    model_config = ConfigDict(from_attributes=True, frozen=True, defer_build=False)
+    
     id: int
     agent_id: str
     name: str
@@ -25,50 +38,93 @@ class AgentResponse(BaseModel):
     completed_tasks: int
     failed_tasks: int
     created_at: datetime
-    
-    class Config:
-        from_attributes = True
 
 
-@router.get("/", response_model=List[AgentResponse])
+# Columns selected for AgentResponse, so rows are never built as ORM objects
+_AGENT_COLUMNS = (
+    Agent.id,
+    Agent.agent_id,
+    Agent.name,
+    Agent.role,
+    Agent.status,
+    Agent.total_tasks,
+    Agent.completed_tasks,
+    Agent.failed_tasks,
+    Agent.created_at,
+)
+
+# List cursor parameters and the columns they page through, in sort order
+_AGENT_CURSOR = {"after_name": Agent.name, "after_id": Agent.id}
+
+
+@router.get(
+    "/",
+    response_class=StreamingResponse,
+    responses={200: {"model": List[AgentResponse]}}
+)
 async def list_agents(
-    skip: int = 0,
+    request: Request,
     limit: int = 100,
     status: Optional[AgentStatus] = None,
+    after_name: Optional[str] = None,
+    after_id: Optional[int] = None,
     db: AsyncSession = Depends(get_db)
 ):
-    """List all agents"""
-    query = select(Agent)
+    """
+    List agents ordered by name.
+
+    A full page has a Link header (rel="next") to the following page; its
+    after_name/after_id are the name and id of the page's last agent and
+    must be given together. Rows are streamed as they are fetched.
+    """
+    require_complete_cursor(after_name=after_name, after_id=after_id)
+    
+    query = select(*_AGENT_COLUMNS)
     
     if status:
         query = query.where(Agent.status == status)
     
-    query = query.offset(skip).limit(limit).order_by(Agent.name)
+    if after_id is not None:
+        query = query.where(tuple_(Agent.name, Agent.id) > tuple_(after_name, after_id))
     
-    result = await db.execute(query)
-    agents = result.scalars().all()
-    
-    return agents
+    return await json_array_response(
+        db,
+        keyset_page(query, _AGENT_CURSOR, limit),
+        AgentResponse,
+        headers=next_page_link(request, tuple(_AGENT_CURSOR), limit)
+    )
 
 
-@router.get("/{agent_id}", response_model=AgentResponse)
-async def get_agent(
-    agent_id: str,
-    db: AsyncSession = Depends(get_db)
-):
-    """Get agent by ID"""
+async def _load_agent(agent_id: str, db: AsyncSession) -> Dict[str, Any]:
+    """Load an agent as a plain dict, served from cache when fresh."""
+    cached = _agent_cache.get(agent_id)
+    if cached is not None:
+        return cached
+
     result = await db.execute(
-        select(Agent).where(Agent.agent_id == agent_id)
+        select(*_AGENT_COLUMNS, Agent.success_rate).where(Agent.agent_id == agent_id)
     )
-    agent = result.scalar_one_or_none()
+    row = result.mappings().one_or_none()
     
-    if not agent:
+    if not row:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Agent {agent_id} not found"
         )
     
-    return agent
+    # Cache plain values, not a row tied to this session's result
+    snapshot = dict(row)
+    _agent_cache.set(agent_id, snapshot)
+    return snapshot
+
+
+@router.get("/{agent_id}", response_model=AgentResponse)
+async def get_agent(
+    agent_id: str,
+    db: AsyncSession = Depends(get_db)
+):
+    """Get agent by ID"""
+    return await _load_agent(agent_id, db)
 
 
 @router.get("/{agent_id}/stats")
@@ -77,30 +133,36 @@ async def get_agent_stats(
     db: AsyncSession = Depends(get_db)
 ):
     """Get agent statistics"""
+    # success_rate is a generated column, already rounded by the database
+    agent = await _load_agent(agent_id, db)
+    
+    # One grouped aggregate over the window instead of loading task rows
+    # Compare against the database clock that filled created_at
+    since = utc_now() - RECENT_WINDOW
     result = await db.execute(
-        select(Agent).where(Agent.agent_id == agent_id)
+        select(
+            func.count().label("total"),
+            func.count().filter(Task.status == "completed").label("completed"),
+            func.count().filter(Task.status == "failed").label("failed"),
+        ).where(Task.assigned_to == agent_id, Task.created_at >= since)
     )
-    agent = result.scalar_one_or_none()
-    
-    if not agent:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Agent {agent_id} not found"
-        )
-    
-    success_rate = 0
-    if agent.total_tasks > 0:
-        success_rate = (agent.completed_tasks / agent.total_tasks) * 100
+    recent = result.mappings().one()
     
     return {
-        "agent_id": agent.agent_id,
-        "name": agent.name,
-        "role": agent.role,
-        "status": agent.status,
+        "agent_id": agent["agent_id"],
+        "name": agent["name"],
+        "role": agent["role"],
+        "status": agent["status"],
         "statistics": {
-            "total_tasks": agent.total_tasks,
-            "completed_tasks": agent.completed_tasks,
-            "failed_tasks": agent.failed_tasks,
-            "success_rate": round(success_rate, 2)
+            "total_tasks": agent["total_tasks"],
+            "completed_tasks": agent["completed_tasks"],
+            "failed_tasks": agent["failed_tasks"],
+            "success_rate": agent["success_rate"]
+        },
+        "recent_tasks": {
+            "window_hours": int(RECENT_WINDOW.total_seconds() // 3600),
+            "total": recent["total"],
+            "completed": recent["completed"],
+            "failed": recent["failed"]
         }
     }
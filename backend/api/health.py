@@ -1,7 +1,11 @@
 """
 Health Check Endpoints
 """
-from fastapi import APIRouter, Depends
+import asyncio
+import hashlib
+import httpx
+import orjson
+from fastapi import APIRouter, Depends, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import text
 import redis.asyncio as redis
@@ -11,53 +15,108 @@ from core.config import settings
 
 router = APIRouter()
 
+# Per-probe deadlines so one slow service can't stall the whole check
+DB_TIMEOUT = 2.0
+REDIS_TIMEOUT = 1.0
+OLLAMA_TIMEOUT = 5.0
+
+# One small pool reused by every probe instead of a new connection per call.
+# Concurrent probes beyond its size wait for a free connection (instead of
+# failing with "Too many connections"), for less than the probe's deadline.
+_redis = redis.Redis.from_pool(
+    redis.BlockingConnectionPool.from_url(
+        settings.REDIS_URL,
+        max_connections=4,
+        timeout=REDIS_TIMEOUT / 2,
+        health_check_interval=30
+    )
+)
+
+_ollama_client = httpx.AsyncClient(
+    base_url=settings.OLLAMA_BASE_URL,
+    timeout=5.0,
+    limits=httpx.Limits(max_keepalive_connections=2)
+)
+
+
+async def close_clients() -> None:
+    """Close the pooled clients used by health probes."""
+    await _redis.aclose()
+    await _ollama_client.aclose()
+
+
+# The basic health body never changes within a process
+_HEALTH_BODY = orjson.dumps({
+    "status": "healthy",
+    "service": "AI Software Factory",
+    "version": settings.VERSION
+})
+_HEALTH_ETAG = f'"{hashlib.sha1(_HEALTH_BODY).hexdigest()}"'
+
 
 @router.get("/health")
-async def health_check():
+async def health_check(request: Request):
     """Basic health check"""
-    return {
-        "status": "healthy",
-        "service": "AI Software Factory",
-        "version": settings.VERSION
-    }
+    if request.headers.get("if-none-match") == _HEALTH_ETAG:
+        return Response(status_code=304, headers={"ETag": _HEALTH_ETAG})
+    
+    return Response(
+        content=_HEALTH_BODY,
+        media_type="application/json",
+        headers={"ETag": _HEALTH_ETAG}
+    )
 
 
-@router.get("/health/detailed")
-async def detailed_health_check(db: AsyncSession = Depends(get_db)):
-    """Detailed health check with all services"""
-    health_status = {
-        "status": "healthy",
-        "services": {}
-    }
-    
-    # Check Database
+async def _check_db(db: AsyncSession) -> str:
     try:
-        await db.execute(text("SELECT 1"))
-        health_status["services"]["database"] = "healthy"
+        await asyncio.wait_for(db.execute(text("SELECT 1")), timeout=DB_TIMEOUT)
+        return "healthy"
+    except asyncio.TimeoutError:
+        return "unhealthy: timeout"
     except Exception as e:
-        health_status["services"]["database"] = f"unhealthy: {str(e)}"
-        health_status["status"] = "degraded"
-    
-    # Check Redis
+        return f"unhealthy: {str(e)}"
+
+
+async def _check_redis() -> str:
     try:
-        r = redis.from_url(settings.REDIS_URL)
-        await r.ping()
-        await r.close()
-        health_status["services"]["redis"] = "healthy"
+        await asyncio.wait_for(_redis.ping(), timeout=REDIS_TIMEOUT)
+        return "healthy"
+    except asyncio.TimeoutError:
+        return "unhealthy: timeout"
     except Exception as e:
-        health_status["services"]["redis"] = f"unhealthy: {str(e)}"
-        health_status["status"] = "degraded"
-    
-    # Check Ollama (if configured)
+        return f"unhealthy: {str(e)}"
+
+
+async def _check_ollama() -> str:
     try:
-        import httpx
-        async with httpx.AsyncClient() as client:
-            response = await client.get(f"{settings.OLLAMA_BASE_URL}/api/tags", timeout=5.0)
-            if response.status_code == 200:
-                health_status["services"]["ollama"] = "healthy"
-            else:
-                health_status["services"]["ollama"] = "unhealthy"
+        response = await asyncio.wait_for(
+            _ollama_client.get("/api/tags"),
+            timeout=OLLAMA_TIMEOUT
+        )
+        return "healthy" if response.status_code == 200 else "unhealthy"
+    except asyncio.TimeoutError:
+        return "unavailable: timeout"
     except Exception as e:
-        health_status["services"]["ollama"] = f"unavailable: {str(e)}"
+        return f"unavailable: {str(e)}"
+
+
+@router.get("/health/detailed")
+async def detailed_health_check(db: AsyncSession = Depends(get_db)):
+    """Detailed health check with all services"""
+    database, redis_status, ollama = await asyncio.gather(
+        _check_db(db),
+        _check_redis(),
+        _check_ollama()
+    )
     
-    return health_status
+    # Ollama is optional, so it does not degrade the overall status
+    degraded = database != "healthy" or redis_status != "healthy"
+    
+    return {
+        "status": "degraded" if degraded else "healthy",
+        "services": {
+            "database": database,
+            "redis": redis_status,
+            "ollama": ollama
+        }
+    }
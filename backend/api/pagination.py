@@ -0,0 +1,97 @@
+"""
+Keyset Pagination
+Cursor helpers shared by the list endpoints.
+"""
+from datetime import datetime
+from typing import Any, Callable, Dict, Mapping, Optional, Sequence
+from fastapi import HTTPException, Request, status
+from sqlalchemy import ColumnElement, Row, Select, func, select
+
+# Labels of the columns keyset_page() adds to every row
+PAGE_SIZE_LABEL = "page_size"
+NEXT_PREFIX = "next_"
+
+
+def require_complete_cursor(**params: Optional[Any]) -> None:
+    """
+    Reject a cursor given only in part.
+
+    Dropping the filter instead would serve the first page again, and a
+    client following cursors would loop forever.
+    """
+    given = [name for name, value in params.items() if value is not None]
+    if given and len(given) != len(params):
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"{' and '.join(params)} must be given together"
+        )
+
+
+def keyset_page(
+    query: Select,
+    cursor: Mapping[str, ColumnElement],
+    limit: int,
+    descending: bool = False
+) -> Select:
+    """
+    Limit a query to one page ordered by its cursor columns.
+
+    Every row also carries the page size and the cursor values of the
+    page's last row (as next_<param>), so the first rows fetched are
+    enough to link to the next page. Window functions run before LIMIT,
+    which is why the page is taken in a subquery.
+
+    Args:
+        query: Filtered column query
+        cursor: Cursor query parameter names mapped to their columns, in
+            sort order (the last one must be unique)
+        limit: Page size
+        descending: Sort newest/largest first
+
+    Returns:
+        Page query
+    """
+    keys = [f"_key_{name}" for name in cursor]
+    page = (
+        query.add_columns(*(column.label(key) for key, column in zip(keys, cursor.values())))
+        .order_by(*(column.desc() if descending else column for column in cursor.values()))
+        .limit(limit)
+        .subquery()
+    )
+    order = [page.c[key].desc() if descending else page.c[key] for key in keys]
+
+    return select(
+        page,
+        func.count().over().label(PAGE_SIZE_LABEL),
+        *(
+            func.last_value(page.c[key])
+            .over(order_by=order, range_=(None, None))
+            .label(f"{NEXT_PREFIX}{name}")
+            for key, name in zip(keys, cursor)
+        )
+    ).order_by(*order)
+
+
+def next_page_link(
+    request: Request,
+    params: Sequence[str],
+    limit: int
+) -> Callable[[Sequence[Row]], Dict[str, str]]:
+    """
+    Build the headers of a keyset_page() response from its first rows.
+
+    A full page gets a Link header (rel="next") to the same URL with the
+    cursor parameters set to the page's last row.
+    """
+    def headers(first: Sequence[Row]) -> Dict[str, str]:
+        if not first or first[0]._mapping[PAGE_SIZE_LABEL] < limit:
+            return {}
+
+        row = first[0]._mapping
+        values = {}
+        for name in params:
+            value = row[f"{NEXT_PREFIX}{name}"]
+            values[name] = value.isoformat() if isinstance(value, datetime) else value
+        return {"Link": f'<{request.url.include_query_params(**values)}>; rel="next"'}
+
+    return headers
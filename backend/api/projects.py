@@ -2,12 +2,15 @@
 Projects API Endpoints
 """
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from pydantic import BaseModel
+from sqlalchemy import delete, insert, select, tuple_
+from pydantic import BaseModel, ConfigDict
 from datetime import datetime
 
+from api.pagination import keyset_page, next_page_link, require_complete_cursor
+from api.streaming import json_array_response
 from database.session import get_db
 from database.models import Project, ProjectStatus
 
@@ -24,6 +27,8 @@ class ProjectCreate(BaseModel):
 
 class ProjectResponse(BaseModel):
     """Project response schema"""
+    model_config = ConfigDict(from_attributes=True, frozen=True, defer_build=False)
+    
     id: int
     name: str
     description: Optional[str]
@@ -32,9 +37,22 @@ class ProjectResponse(BaseModel):
     tech_stack: Optional[dict]
     created_at: datetime
     updated_at: datetime
-    
-    class Config:
-        from_attributes = True
+
+
+# Columns selected for ProjectResponse, so list rows skip ORM hydration
+_PROJECT_COLUMNS = (
+    Project.id,
+    Project.name,
+    Project.description,
+    Project.status,
+    Project.requirements,
+    Project.tech_stack,
+    Project.created_at,
+    Project.updated_at,
+)
+
+# List cursor parameters and the columns they page through, in sort order
+_PROJECT_CURSOR = {"after_created_at": Project.created_at, "after_id": Project.id}
 
 
 @router.post("/", response_model=ProjectResponse, status_code=status.HTTP_201_CREATED)
@@ -43,40 +61,63 @@ async def create_project(
     db: AsyncSession = Depends(get_db)
 ):
     """Create a new project"""
-    project = Project(
-        name=project_data.name,
-        description=project_data.description,
-        requirements=project_data.requirements,
-        created_by=project_data.created_by,
-        status=ProjectStatus.PENDING
+    # INSERT ... RETURNING replaces add/flush/refresh with one round-trip
+    result = await db.execute(
+        insert(Project)
+        .values(
+            name=project_data.name,
+            description=project_data.description,
+            requirements=project_data.requirements,
+            created_by=project_data.created_by,
+            status=ProjectStatus.PENDING
+        )
+        .returning(*_PROJECT_COLUMNS)
     )
-    
-    db.add(project)
+    project = ProjectResponse.model_validate(result.mappings().one())
     await db.commit()
-    await db.refresh(project)
     
     return project
 
 
-@router.get("/", response_model=List[ProjectResponse])
+@router.get(
+    "/",
+    response_class=StreamingResponse,
+    responses={200: {"model": List[ProjectResponse]}}
+)
 async def list_projects(
-    skip: int = 0,
+    request: Request,
     limit: int = 100,
     status: Optional[ProjectStatus] = None,
+    after_created_at: Optional[datetime] = None,
+    after_id: Optional[int] = None,
     db: AsyncSession = Depends(get_db)
 ):
-    """List all projects"""
-    query = select(Project)
+    """
+    List projects, newest first.
+
+    A full page has a Link header (rel="next") to the following page; its
+    after_created_at/after_id are the created_at and id of the page's last
+    project and must be given together. Rows are streamed in batches as
+    they are fetched.
+    """
+    require_complete_cursor(after_created_at=after_created_at, after_id=after_id)
+    
+    query = select(*_PROJECT_COLUMNS)
     
     if status:
         query = query.where(Project.status == status)
     
-    query = query.offset(skip).limit(limit).order_by(Project.created_at.desc())
-    
-    result = await db.execute(query)
-    projects = result.scalars().all()
+    if after_id is not None:
+        query = query.where(
+            tuple_(Project.created_at, Project.id) < tuple_(after_created_at, after_id)
+        )
     
-    return projects
+    return await json_array_response(
+        db,
+        keyset_page(query, _PROJECT_CURSOR, limit, descending=True),
+        ProjectResponse,
+        headers=next_page_link(request, tuple(_PROJECT_CURSOR), limit)
+    )
 
 
 @router.get("/{project_id}", response_model=ProjectResponse)
@@ -105,16 +146,18 @@ async def delete_project(
     db: AsyncSession = Depends(get_db)
 ):
     """Delete a project"""
+    # Tasks and messages go with it through ON DELETE CASCADE
     result = await db.execute(
-        select(Project).where(Project.id == project_id)
+        delete(Project)
+        .where(Project.id == project_id)
+        .returning(Project.id)
+        .execution_options(synchronize_session=False)
     )
-    project = result.scalar_one_or_none()
     
-    if not project:
+    if result.scalar_one_or_none() is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Project {project_id} not found"
         )
     
-    await db.delete(project)
     await db.commit()
@@ -1,26 +1,54 @@
 """
 Settings API Endpoints - API Key Management
 """
-from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import List, Optional, Tuple
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from pydantic import BaseModel
+from sqlalchemy import func, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from pydantic import BaseModel, ConfigDict
 from datetime import datetime
-from cryptography.fernet import Fernet
-import base64
+import os
+import orjson
+
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+from cryptography.hazmat.primitives.kdf.hkdf import HKDF
 
 from database.session import get_db
-from database.models import APIKey
+from database.models import APIKey, utc_now
 from core.config import settings as app_settings
 
 router = APIRouter()
 
-# Simple encryption for API keys (use proper key management in production)
+# Simple encryption for API keys (use proper key management in production).
+# SECRET_KEY is fixed for the life of the process, so the cipher is built once.
+# AES-256-GCM works on raw bytes, avoiding Fernet's base64 token framing.
+# HKDF uses the whole SECRET_KEY rather than its first 32 characters.
+_AES_KEY = HKDF(
+    algorithm=hashes.SHA256(),
+    length=32,
+    salt=None,
+    info=b"ai-software-factory:api-keys"
+).derive(app_settings.SECRET_KEY.encode())
+_CIPHER = AESGCM(_AES_KEY)
+NONCE_SIZE = 12
+
+
 def get_cipher():
-    """Get Fernet cipher for encryption"""
-    key = base64.urlsafe_b64encode(app_settings.SECRET_KEY.encode()[:32].ljust(32, b'0'))
-    return Fernet(key)
+    """Get AES-GCM cipher for encryption"""
+    return _CIPHER
+
+
+def encrypt_api_key(plaintext: str) -> Tuple[bytes, bytes]:
+    """Encrypt an API key, returning (nonce, ciphertext)"""
+    nonce = os.urandom(NONCE_SIZE)
+    return nonce, _CIPHER.encrypt(nonce, plaintext.encode(), None)
+
+
+def decrypt_api_key(nonce: bytes, ciphertext: bytes) -> str:
+    """Decrypt an API key stored as nonce + ciphertext"""
+    return _CIPHER.decrypt(nonce, ciphertext, None).decode()
 
 
 class APIKeyCreate(BaseModel):
@@ -40,6 +68,8 @@ class APIKeyUpdate(BaseModel):
 
 class APIKeyResponse(BaseModel):
     """API Key response schema (masked)"""
+    model_config = ConfigDict(from_attributes=True, frozen=True, defer_build=False)
+    
     id: int
     provider: str
     api_key_masked: str
@@ -48,9 +78,20 @@ class APIKeyResponse(BaseModel):
     created_at: datetime
     updated_at: datetime
     last_used: Optional[datetime]
-    
-    class Config:
-        from_attributes = True
+
+
+# Columns selected for APIKeyResponse; the encrypted key itself is never read.
+# Handlers return the rows as they are and response_model validates them once.
+_API_KEY_COLUMNS = (
+    APIKey.id,
+    APIKey.provider,
+    APIKey.api_key_masked,
+    APIKey.base_url,
+    APIKey.is_active,
+    APIKey.created_at,
+    APIKey.updated_at,
+    APIKey.last_used,
+)
 
 
 def mask_api_key(key: str) -> str:
@@ -63,31 +104,10 @@ def mask_api_key(key: str) -> str:
 @router.get("/api-keys", response_model=List[APIKeyResponse])
 async def list_api_keys(db: AsyncSession = Depends(get_db)):
     """List all configured API keys (masked)"""
-    result = await db.execute(select(APIKey))
-    api_keys = result.scalars().all()
-    
-    response = []
-    cipher = get_cipher()
-    
-    for key in api_keys:
-        try:
-            decrypted = cipher.decrypt(key.api_key.encode()).decode()
-            masked = mask_api_key(decrypted)
-        except:
-            masked = "****"
-        
-        response.append(APIKeyResponse(
-            id=key.id,
-            provider=key.provider,
-            api_key_masked=masked,
-            base_url=key.base_url,
-            is_active=key.is_active,
-            created_at=key.created_at,
-            updated_at=key.updated_at,
-            last_used=key.last_used
-        ))
+    # The masked hint is stored at write time, so listing needs no decryption
+    result = await db.execute(select(*_API_KEY_COLUMNS))
     
-    return response
+    return result.mappings().all()
 
 
 @router.post("/api-keys", response_model=APIKeyResponse, status_code=status.HTTP_201_CREATED)
@@ -96,48 +116,57 @@ async def create_api_key(
     db: AsyncSession = Depends(get_db)
 ):
     """Create or update API key"""
-    cipher = get_cipher()
+    # Encrypt API key
+    nonce, encrypted = encrypt_api_key(key_data.api_key)
+    masked = mask_api_key(key_data.api_key)
+    
+    # Single round trip: insert, or update the existing row for this provider
+    stmt = pg_insert(APIKey).values(
+        provider=key_data.provider,
+        api_key=encrypted,
+        nonce=nonce,
+        api_key_masked=masked,
+        base_url=key_data.base_url,
+        is_active=key_data.is_active
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[APIKey.provider],
+        set_={
+            "api_key": encrypted,
+            "nonce": nonce,
+            "api_key_masked": masked,
+            # Keep the stored base_url when none is given
+            "base_url": func.coalesce(stmt.excluded.base_url, APIKey.base_url),
+            "is_active": key_data.is_active,
+            "updated_at": utc_now()
+        }
+    ).returning(*_API_KEY_COLUMNS)
+    
+    result = await db.execute(stmt)
+    api_key = result.mappings().one()
+    await db.commit()
     
-    # Check if provider already exists
+    return api_key
+
+
+@router.post("/api-keys/mark-used")
+async def mark_api_keys_used(
+    providers: List[str],
+    db: AsyncSession = Depends(get_db)
+):
+    """Record usage for several providers in one statement"""
     result = await db.execute(
-        select(APIKey).where(APIKey.provider == key_data.provider)
+        update(APIKey)
+        .where(APIKey.provider.in_(providers))
+        # Usage is not a configuration change, so keep updated_at as is
+        .values(last_used=utc_now(), updated_at=APIKey.updated_at)
+        .returning(APIKey.provider)
+        .execution_options(synchronize_session=False)
     )
-    existing = result.scalar_one_or_none()
-    
-    # Encrypt API key
-    encrypted = cipher.encrypt(key_data.api_key.encode()).decode()
-    
-    if existing:
-        # Update existing
-        existing.api_key = encrypted
-        if key_data.base_url:
-            existing.base_url = key_data.base_url
-        existing.is_active = key_data.is_active
-        existing.updated_at = datetime.utcnow()
-        api_key = existing
-    else:
-        # Create new
-        api_key = APIKey(
-            provider=key_data.provider,
-            api_key=encrypted,
-            base_url=key_data.base_url,
-            is_active=key_data.is_active
-        )
-        db.add(api_key)
-    
+    marked = result.scalars().all()
     await db.commit()
-    await db.refresh(api_key)
     
-    return APIKeyResponse(
-        id=api_key.id,
-        provider=api_key.provider,
-        api_key_masked=mask_api_key(key_data.api_key),
-        base_url=api_key.base_url,
-        is_active=api_key.is_active,
-        created_at=api_key.created_at,
-        updated_at=api_key.updated_at,
-        last_used=api_key.last_used
-    )
+    return {"marked": marked}
 
 
 @router.patch("/api-keys/{provider}", response_model=APIKeyResponse)
@@ -158,10 +187,9 @@ async def update_api_key(
             detail=f"API key for provider '{provider}' not found"
         )
     
-    cipher = get_cipher()
-    
     if key_data.api_key:
-        api_key.api_key = cipher.encrypt(key_data.api_key.encode()).decode()
+        api_key.nonce, api_key.api_key = encrypt_api_key(key_data.api_key)
+        api_key.api_key_masked = mask_api_key(key_data.api_key)
     
     if key_data.base_url is not None:
         api_key.base_url = key_data.base_url
@@ -169,28 +197,13 @@ async def update_api_key(
     if key_data.is_active is not None:
         api_key.is_active = key_data.is_active
     
-    api_key.updated_at = datetime.utcnow()
+    # onupdate only fires when a column changed; a PATCH always counts
+    api_key.updated_at = utc_now()
     
     await db.commit()
     await db.refresh(api_key)
     
-    # Get masked key
-    try:
-        decrypted = cipher.decrypt(api_key.api_key.encode()).decode()
-        masked = mask_api_key(decrypted)
-    except:
-        masked = "****"
-    
-    return APIKeyResponse(
-        id=api_key.id,
-        provider=api_key.provider,
-        api_key_masked=masked,
-        base_url=api_key.base_url,
-        is_active=api_key.is_active,
-        created_at=api_key.created_at,
-        updated_at=api_key.updated_at,
-        last_used=api_key.last_used
-    )
+    return api_key
 
 
 @router.delete("/api-keys/{provider}", status_code=status.HTTP_204_NO_CONTENT)
@@ -214,16 +227,20 @@ async def delete_api_key(
     await db.commit()
 
 
+# Configuration is fixed for the life of the process, so serialize it once
+_CONFIG_JSON = orjson.dumps({
+    "app_name": app_settings.APP_NAME,
+    "version": app_settings.VERSION,
+    "default_llm_provider": app_settings.DEFAULT_LLM_PROVIDER,
+    "default_model": app_settings.DEFAULT_MODEL,
+    "max_agents": app_settings.MAX_AGENTS,
+    "max_concurrent_projects": app_settings.MAX_CONCURRENT_PROJECTS,
+    "memory_backend": app_settings.MEMORY_BACKEND,
+    "ollama_available": app_settings.OLLAMA_BASE_URL is not None,
+})
+
+
 @router.get("/config")
 async def get_configuration():
     """Get current system configuration (non-sensitive)"""
-    return {
-        "app_name": app_settings.APP_NAME,
-        "version": app_settings.VERSION,
-        "default_llm_provider": app_settings.DEFAULT_LLM_PROVIDER,
-        "default_model": app_settings.DEFAULT_MODEL,
-        "max_agents": app_settings.MAX_AGENTS,
-        "max_concurrent_projects": app_settings.MAX_CONCURRENT_PROJECTS,
-        "memory_backend": app_settings.MEMORY_BACKEND,
-        "ollama_available": app_settings.OLLAMA_BASE_URL is not None,
-    }
+    return Response(content=_CONFIG_JSON, media_type="application/json")
@@ -0,0 +1,69 @@
+"""
+Streaming Responses
+Incremental JSON array encoding for list endpoints.
+"""
+import functools
+from typing import AsyncIterator, Callable, Dict, List, Optional, Sequence, Type
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, TypeAdapter
+from sqlalchemy import Row, Select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# Rows validated and encoded per TypeAdapter call
+STREAM_BATCH_SIZE = 100
+
+
+@functools.lru_cache(maxsize=None)
+def _list_adapter(model: Type[BaseModel]) -> TypeAdapter:
+    return TypeAdapter(List[model])
+
+
+async def stream_json_array(
+    first: Sequence[Row],
+    rest: AsyncIterator[Sequence[Row]],
+    model: Type[BaseModel]
+) -> AsyncIterator[bytes]:
+    """
+    Yield row batches as one JSON array of model objects.
+
+    Rows are validated and encoded a batch at a time through a list
+    TypeAdapter.
+    """
+    adapter = _list_adapter(model)
+
+    yield b"["
+    separator = b""
+    batch: Optional[Sequence[Row]] = first
+    while batch:
+        items = adapter.validate_python(batch, from_attributes=True)
+        # Drop the batch's own brackets and splice it into the array
+        yield separator + adapter.dump_json(items)[1:-1]
+        separator = b","
+        batch = await anext(rest, None)
+    yield b"]"
+
+
+async def json_array_response(
+    db: AsyncSession,
+    query: Select,
+    model: Type[BaseModel],
+    headers: Optional[Callable[[Sequence[Row]], Dict[str, str]]] = None
+) -> StreamingResponse:
+    """
+    Stream the rows of a column query as a JSON array response.
+
+    The query runs and its first batch is fetched before the response
+    starts, so a failing query still produces an error status instead of
+    a truncated 200 body. db is the request's get_db session, which stays
+    open until the body has been sent. headers, if given, builds the
+    response headers from that first batch.
+    """
+    result = await db.stream(query)
+    partitions = result.partitions(STREAM_BATCH_SIZE)
+    first = await anext(partitions, [])
+
+    return StreamingResponse(
+        stream_json_array(first, partitions, model),
+        media_type="application/json",
+        headers=headers(first) if headers else None
+    )
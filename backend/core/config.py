@@ -2,11 +2,11 @@
 Configuration Management
 Centralized settings with security best practices.
 """
-import os
 import secrets
+from functools import lru_cache
 from typing import List, Optional
-from pydantic_settings import BaseSettings
-from pydantic import Field, field_validator
+from pydantic_settings import BaseSettings, SettingsConfigDict
+from pydantic import Field, field_validator, model_validator
 
 
 class Settings(BaseSettings):
@@ -24,6 +24,7 @@ class Settings(BaseSettings):
     # API
     API_PREFIX: str = "/api"
     API_VERSION: str = "v1"
+    WORKERS: int = 1  # Uvicorn worker processes; each has its own DB pool
 
     # CORS - Restrict in production
     CORS_ORIGINS: List[str] = Field(
@@ -32,7 +33,8 @@ class Settings(BaseSettings):
     )
     CORS_ALLOW_CREDENTIALS: bool = True
     CORS_ALLOW_METHODS: List[str] = ["GET", "POST", "PUT", "DELETE", "PATCH"]
-    CORS_ALLOW_HEADERS: List[str] = ["*"]
+    CORS_ALLOW_HEADERS: List[str] = ["Authorization", "Content-Type", "If-None-Match", "X-Requested-With"]
+    CORS_EXPOSE_HEADERS: List[str] = ["Link"]  # Next-page links of list endpoints
 
     # Database
     DATABASE_URL: str = Field(
@@ -42,7 +44,11 @@ class Settings(BaseSettings):
     DATABASE_POOL_SIZE: int = 10
     DATABASE_POOL_OVERFLOW: int = 20
     DATABASE_POOL_TIMEOUT: int = 30
+    DATABASE_POOL_RECYCLE: int = 1800  # Seconds before a connection is replaced
     DATABASE_ECHO: bool = False
+    # Set to "transaction" when DATABASE_URL points at PgBouncer in transaction
+    # pooling mode: PgBouncer then owns pooling and prepared statements are off
+    PGBOUNCER_MODE: Optional[str] = None
 
     # Redis
     REDIS_URL: str = Field(
@@ -92,11 +98,25 @@ class Settings(BaseSettings):
     DEFAULT_TEMPERATURE: float = 0.7
     DEFAULT_MAX_TOKENS: int = 4096
 
+    # LLM Response Cache (only temperature 0 calls are cached)
+    LLM_CACHE_ENABLED: bool = False
+    LLM_CACHE_TTL: int = 86400
+    LLM_SEMANTIC_CACHE_ENABLED: bool = False  # Requires Redis Stack (RediSearch)
+    LLM_SEMANTIC_CACHE_THRESHOLD: float = 0.92
+    LLM_CACHE_EMBEDDING_MODEL: str = "text-embedding-3-small"
+
+    # LLM Rate Limits (0 disables)
+    LLM_RPM: int = 0  # Requests per minute across all agents
+    LLM_TPM: int = 0  # Estimated prompt tokens per minute across all agents
+
     # Agent Configuration
     MAX_AGENTS: int = 21
     AGENT_TIMEOUT: int = 300
     MAX_ITERATIONS: int = 10
     AGENT_VERBOSE: bool = False
+    AGENT_MAX_CONCURRENCY: int = 3  # Concurrent crews per phase
+    AGENT_WORKERS: int = 8  # Threads running blocking crew kickoffs
+    AGENT_TASK_CACHE_PATH: Optional[str] = None  # SQLite file for task outputs and pending batches across runs
 
     # Memory Configuration
     MEMORY_BACKEND: str = "chromadb"
@@ -110,10 +130,8 @@ class Settings(BaseSettings):
 
     # Security
     SECRET_KEY: str = Field(
-        default_factory=lambda: os.environ.get(
-            "SECRET_KEY",
-            secrets.token_urlsafe(64)
-        ),
+        # A per-process random key is only usable with a single worker
+        default_factory=lambda: secrets.token_urlsafe(64),
         description="Secret key for JWT and encryption - MUST be set in production"
     )
     ENCRYPTION_KEY: Optional[str] = Field(
@@ -145,6 +163,27 @@ class Settings(BaseSettings):
     METRICS_PORT: int = 9090
     HEALTH_CHECK_INTERVAL: int = 30
 
+    @model_validator(mode="before")
+    @classmethod
+    def require_pinned_secret_key(cls, data):
+        """Refuse a random SECRET_KEY where processes must share one."""
+        if not isinstance(data, dict) or data.get("SECRET_KEY"):
+            return data
+
+        try:
+            workers = int(data.get("WORKERS", 1))
+        except (TypeError, ValueError):
+            workers = 1  # Reported by field validation
+        environment = str(data.get("ENVIRONMENT", "development")).lower()
+
+        # Each worker (and each restart) would otherwise generate its own
+        # key, and API keys encrypted by one could not be decrypted by another
+        if workers > 1 or environment == "production":
+            raise ValueError(
+                "SECRET_KEY must be set when WORKERS > 1 or ENVIRONMENT is production"
+            )
+        return data
+
     @field_validator("SECRET_KEY")
     @classmethod
     def validate_secret_key(cls, v: str, info) -> str:
@@ -184,11 +223,24 @@ class Settings(BaseSettings):
         """Get synchronous database URL for migrations."""
         return self.DATABASE_URL.replace("+asyncpg", "")
 
-    class Config:
-        env_file = "../config/.env"
-        env_file_encoding = "utf-8"
-        case_sensitive = True
-        extra = "ignore"
+    model_config = SettingsConfigDict(
+        env_file="../config/.env",
+        env_file_encoding="utf-8",
+        case_sensitive=True,
+        extra="ignore",
+        frozen=True,  # Settings are read-only once loaded
+    )
+
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """
+    Load settings once per process.
+
+    Modules bind the module-level ``settings`` at import time, so clearing
+    this cache does not change the settings they already hold.
+    """
+    return Settings()
 
 
-settings = Settings()
+settings = get_settings()
@@ -1,15 +1,21 @@
 """
 Database Models
 """
-from datetime import datetime
 from typing import Optional
-from sqlalchemy import Column, Integer, String, DateTime, Text, JSON, Boolean, ForeignKey, Enum
+from sqlalchemy import Column, Computed, Integer, LargeBinary, Numeric, String, DateTime, Text, Boolean, ForeignKey, Enum, Index, func
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
 import enum
 
 from database.session import Base
 
 
+def utc_now():
+    """Database clock in UTC, matching the naive UTC DateTime columns"""
+    # now() would return the session time zone's local time for these columns
+    return func.timezone("utc", func.now(), type_=DateTime)
+
+
 class ProjectStatus(str, enum.Enum):
     """Project status enum"""
     PENDING = "pending"
@@ -38,26 +44,37 @@ class Project(Base):
     description = Column(Text)
     status = Column(Enum(ProjectStatus), default=ProjectStatus.PENDING)
     
+    # requirements, tech_stack and architecture have jsonb_path_ops GIN
+    # indexes: only containment (@>) filters can use them
+    
     # Requirements
-    requirements = Column(JSON)
-    user_stories = Column(JSON)
+    requirements = Column(JSONB)
+    user_stories = Column(JSONB)
     
     # Architecture
-    tech_stack = Column(JSON)
-    architecture = Column(JSON)
+    tech_stack = Column(JSONB)
+    architecture = Column(JSONB)
     
     # Timeline
     estimated_completion = Column(DateTime)
     actual_completion = Column(DateTime, nullable=True)
     
     # Metadata
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime, server_default=utc_now())
+    updated_at = Column(DateTime, server_default=utc_now(), onupdate=utc_now())
     created_by = Column(String(100))
     
-    # Relationships
-    tasks = relationship("Task", back_populates="project", cascade="all, delete-orphan")
-    messages = relationship("Message", back_populates="project", cascade="all, delete-orphan")
+    # Relationships (lazy loads raise: load children explicitly, e.g. selectinload;
+    # tasks.project_id and messages.project_id are ON DELETE CASCADE, so
+    # passive_deletes leaves child removal to the database instead of loading them)
+    tasks = relationship(
+        "Task", back_populates="project", cascade="all, delete-orphan",
+        lazy="raise_on_sql", passive_deletes=True
+    )
+    messages = relationship(
+        "Message", back_populates="project", cascade="all, delete-orphan",
+        lazy="raise_on_sql", passive_deletes=True
+    )
 
 
 class Agent(Base):
@@ -71,47 +88,63 @@ class Agent(Base):
     
     # Configuration
     personality = Column(Text)
-    skills = Column(JSON)
-    tools = Column(JSON)
+    skills = Column(JSONB)
+    tools = Column(JSONB)
     
     # Status
     status = Column(Enum(AgentStatus), default=AgentStatus.IDLE)
-    current_task_id = Column(Integer, ForeignKey("tasks.id"), nullable=True)
+    current_task_id = Column(Integer, ForeignKey("tasks.id", ondelete="SET NULL"), nullable=True)
     
     # Statistics
     total_tasks = Column(Integer, default=0)
     completed_tasks = Column(Integer, default=0)
     failed_tasks = Column(Integer, default=0)
+    success_rate = Column(
+        Numeric(5, 2),
+        Computed(
+            "CASE WHEN total_tasks > 0 "
+            "THEN round(completed_tasks::numeric * 100 / total_tasks, 2) "
+            "ELSE 0 END",
+            persisted=True
+        )
+    )
     
     # Metadata
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime, server_default=utc_now())
+    updated_at = Column(DateTime, server_default=utc_now(), onupdate=utc_now())
     
-    # Relationships
-    tasks = relationship("Task", back_populates="assigned_agent", foreign_keys="Task.assigned_to")
+    # Relationships (tasks.assigned_to is ON DELETE SET NULL, so the database
+    # detaches an agent's tasks when it is deleted)
+    tasks = relationship(
+        "Task", back_populates="assigned_agent", foreign_keys="Task.assigned_to",
+        lazy="raise_on_sql", passive_deletes=True
+    )
 
 
 class Task(Base):
     """Task model"""
     __tablename__ = "tasks"
+    __table_args__ = (
+        Index("ix_tasks_project_status", "project_id", "status"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String(255), nullable=False)
     description = Column(Text)
     
     # Assignment
-    project_id = Column(Integer, ForeignKey("projects.id"), nullable=False)
-    assigned_to = Column(String(100), ForeignKey("agents.agent_id"))
+    project_id = Column(Integer, ForeignKey("projects.id", ondelete="CASCADE"), nullable=False)
+    assigned_to = Column(String(100), ForeignKey("agents.agent_id", ondelete="SET NULL"))
     
     # Status
     status = Column(String(50), default="pending")
     priority = Column(String(20), default="normal")
     
     # Dependencies
-    depends_on = Column(JSON)  # List of task IDs
+    depends_on = Column(JSONB)  # List of task IDs
     
     # Results
-    result = Column(JSON)
+    result = Column(JSONB)
     error = Column(Text, nullable=True)
     
     # Timeline
@@ -121,17 +154,22 @@ class Task(Base):
     completed_at = Column(DateTime, nullable=True)
     
     # Metadata
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime, server_default=utc_now())
+    updated_at = Column(DateTime, server_default=utc_now(), onupdate=utc_now())
     
     # Relationships
-    project = relationship("Project", back_populates="tasks")
-    assigned_agent = relationship("Agent", back_populates="tasks", foreign_keys=[assigned_to])
+    project = relationship("Project", back_populates="tasks", lazy="raise_on_sql")
+    assigned_agent = relationship(
+        "Agent", back_populates="tasks", foreign_keys=[assigned_to], lazy="raise_on_sql"
+    )
 
 
 class Message(Base):
     """Message model for agent communication"""
     __tablename__ = "messages"
+    __table_args__ = (
+        Index("ix_messages_project_read", "project_id", "read"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     
@@ -144,20 +182,20 @@ class Message(Base):
     message_type = Column(String(50), default="message")
     subject = Column(String(255))
     content = Column(Text, nullable=False)
-    attachments = Column(JSON)
+    attachments = Column(JSONB)
     
     # Context
-    project_id = Column(Integer, ForeignKey("projects.id"), nullable=True)
-    task_id = Column(Integer, ForeignKey("tasks.id"), nullable=True)
+    project_id = Column(Integer, ForeignKey("projects.id", ondelete="CASCADE"), nullable=True)
+    task_id = Column(Integer, ForeignKey("tasks.id", ondelete="SET NULL"), nullable=True)
     
     # Metadata
     priority = Column(String(20), default="normal")
     requires_response = Column(Boolean, default=False)
     read = Column(Boolean, default=False)
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, server_default=utc_now())
     
     # Relationships
-    project = relationship("Project", back_populates="messages")
+    project = relationship("Project", back_populates="messages", lazy="raise_on_sql")
 
 
 class APIKey(Base):
@@ -166,19 +204,24 @@ class APIKey(Base):
     
     id = Column(Integer, primary_key=True, index=True)
     provider = Column(String(50), nullable=False, unique=True)
-    api_key = Column(String(500), nullable=False)  # Encrypted
+    api_key = Column(LargeBinary, nullable=False)  # AES-GCM ciphertext
+    nonce = Column(LargeBinary(12), nullable=False)
+    api_key_masked = Column(String(16), nullable=False)  # Display hint, e.g. "sk-a...wxyz"
     base_url = Column(String(255), nullable=True)
     is_active = Column(Boolean, default=True)
     
     # Metadata
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime, server_default=utc_now())
+    updated_at = Column(DateTime, server_default=utc_now(), onupdate=utc_now())
     last_used = Column(DateTime, nullable=True)
 
 
 class Memory(Base):
     """Memory/Knowledge base model"""
     __tablename__ = "memories"
+    __table_args__ = (
+        Index("ix_memories_agent_type", "agent_id", "memory_type"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     agent_id = Column(String(100), nullable=False, index=True)
@@ -188,7 +231,8 @@ class Memory(Base):
     
     # Content
     content = Column(Text, nullable=False)
-    meta_data = Column(JSON)
+    # Attribute can't be "metadata" (reserved by declarative Base); the column keeps that name
+    meta = Column("metadata", JSONB, key="meta")
     
     # Context
     project_id = Column(Integer, nullable=True)
@@ -198,6 +242,6 @@ class Memory(Base):
     vector_id = Column(String(255), nullable=True)
     
     # Metadata
-    created_at = Column(DateTime, default=datetime.utcnow)
-    accessed_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, server_default=utc_now())
+    accessed_at = Column(DateTime, server_default=utc_now())
     access_count = Column(Integer, default=0)
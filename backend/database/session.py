@@ -1,18 +1,49 @@
 """
 Database Session Management
 """
+from uuid import uuid4
+import orjson
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from sqlalchemy.orm import declarative_base
+from sqlalchemy.pool import NullPool
 from core.config import settings
 
+
+def _json_dumps(obj) -> str:
+    """Serialize JSONB values with orjson (the driver codec expects str)"""
+    return orjson.dumps(obj).decode()
+
+
+if settings.PGBOUNCER_MODE == "transaction":
+    # A server connection is only held for one transaction, so per-process
+    # pools and asyncpg's prepared statement caches must be disabled, and
+    # statement names must be unique so they can't collide on a shared backend
+    _pool_options = {
+        "poolclass": NullPool,
+        "connect_args": {
+            "statement_cache_size": 0,
+            "prepared_statement_cache_size": 0,
+            "prepared_statement_name_func": lambda: f"__asyncpg_{uuid4()}__",
+        },
+    }
+else:
+    _pool_options = {
+        "pool_pre_ping": True,
+        "pool_size": settings.DATABASE_POOL_SIZE,
+        "max_overflow": settings.DATABASE_POOL_OVERFLOW,
+        "pool_timeout": settings.DATABASE_POOL_TIMEOUT,
+        "pool_recycle": settings.DATABASE_POOL_RECYCLE,
+    }
+
 # Create async engine
 engine = create_async_engine(
     settings.DATABASE_URL,
     echo=settings.DEBUG,
     future=True,
-    pool_pre_ping=True,
-    pool_size=10,
-    max_overflow=20,
+    # The asyncpg dialect registers these as the connection's json/jsonb codecs
+    json_serializer=_json_dumps,
+    json_deserializer=orjson.loads,
+    **_pool_options,
 )
 
 # Create session factory
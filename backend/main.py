@@ -1,10 +1,11 @@
 """
 AI Software Factory - Main Application Entry Point
 """
+import sys
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 import uvicorn
 
 from api import health, projects, agents, settings
@@ -25,6 +26,7 @@ async def lifespan(app: FastAPI):
     
     # Shutdown
     logger.info("Shutting down AI Software Factory...")
+    await health.close_clients()
 
 
 app = FastAPI(
@@ -34,15 +36,18 @@ app = FastAPI(
     lifespan=lifespan,
     docs_url="/api/docs",
     redoc_url="/api/redoc",
+    # orjson encodes datetimes and ints natively and much faster than json
+    default_response_class=ORJSONResponse,
 )
 
 # CORS Configuration
 app.add_middleware(
     CORSMiddleware,
     allow_origins=app_settings.CORS_ORIGINS,
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_credentials=app_settings.CORS_ALLOW_CREDENTIALS,
+    allow_methods=app_settings.CORS_ALLOW_METHODS,
+    allow_headers=app_settings.CORS_ALLOW_HEADERS,
+    expose_headers=app_settings.CORS_EXPOSE_HEADERS,
 )
 
 
@@ -50,7 +55,7 @@ app.add_middleware(
 @app.exception_handler(Exception)
 async def global_exception_handler(request, exc):
     logger.error(f"Global exception: {exc}", exc_info=True)
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=500,
         content={
             "error": "Internal server error",
@@ -83,5 +88,10 @@ if __name__ == "__main__":
         host="0.0.0.0",
         port=8000,
         reload=app_settings.DEBUG,
-        log_level="info"
+        # The reloader runs a single process; workers only apply without it
+        workers=1 if app_settings.DEBUG else app_settings.WORKERS,
+        log_level="info",
+        # uvloop has no Windows build, so use asyncio there
+        loop="asyncio" if sys.platform == "win32" else "uvloop",
+        http="httptools"
     )
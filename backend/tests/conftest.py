@@ -0,0 +1,52 @@
+"""
+Shared test fixtures
+"""
+import os
+
+import pytest
+
+# Keep CrewAI from sending telemetry during tests
+os.environ.setdefault("OTEL_SDK_DISABLED", "true")
+os.environ.setdefault("CREWAI_DISABLE_TELEMETRY", "true")
+
+# Disposable PostgreSQL database for API tests (JSONB, generated columns and
+# RETURNING are used); tests needing it are skipped when it is not set
+TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL")
+
+
+@pytest.fixture
+async def session():
+    """Session on a schema built from the models, as init_db() does."""
+    if not TEST_DATABASE_URL:
+        pytest.skip("TEST_DATABASE_URL is not set")
+
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+    from database.session import Base
+
+    engine = create_async_engine(TEST_DATABASE_URL)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+        await conn.run_sync(Base.metadata.create_all)
+
+    async with async_sessionmaker(engine, expire_on_commit=False)() as session:
+        yield session
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
+    await engine.dispose()
+
+
+@pytest.fixture
+async def client(session):
+    """API client whose requests use the test session."""
+    from httpx import ASGITransport, AsyncClient
+    from database.session import get_db
+    from main import app
+
+    async def override_get_db():
+        yield session
+
+    app.dependency_overrides[get_db] = override_get_db
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        yield client
+    app.dependency_overrides.clear()
@@ -0,0 +1,139 @@
+"""
+Batched task prompt tests
+"""
+from types import SimpleNamespace
+
+import litellm
+import pytest
+from crewai import LLM
+
+from agents.base import AgentConfig, AgentRole, BaseAgent, ProjectContext, TaskSpec
+
+CONTEXT = ProjectContext(project_name="Test project")
+
+
+class StubAgent(BaseAgent):
+    """Agent with fixed task prompts and an offline LLM."""
+
+    batch_tasks = True
+
+    def __init__(self, specs):
+        self._specs = specs
+        super().__init__(AgentConfig(
+            role=AgentRole.QA_ENGINEER,
+            goal="Answer test assignments",
+            backstory="A test agent",
+            verbose=False,
+            memory=False
+        ))
+
+    @property
+    def llm(self):
+        return LLM(model="openai/gpt-4o-mini", api_key="test-key")
+
+    def get_task_specs(self, context):
+        return self._specs
+
+
+def _specs(*, dependent=False):
+    return [
+        TaskSpec(description="List the test levels.", expected_output="A list"),
+        TaskSpec(
+            description="Write one test per level.",
+            expected_output="Test code",
+            uses_previous_output=dependent
+        ),
+    ]
+
+
+def _batched_reply(raw):
+    return SimpleNamespace(raw=raw, tasks_output=[])
+
+
+def test_independent_tasks_are_batched():
+    agent = StubAgent(_specs())
+
+    tasks, batch_size = agent.batch(agent.get_tasks(CONTEXT))
+
+    assert batch_size == 2
+    assert len(tasks) == 1
+    assert "Q[1]: List the test levels." in tasks[0].description
+    assert "Q[2]: Write one test per level." in tasks[0].description
+
+
+def test_dependent_tasks_are_not_batched():
+    agent = StubAgent(_specs(dependent=True))
+    tasks = agent.get_tasks(CONTEXT)
+
+    batched, batch_size = agent.batch(tasks)
+
+    assert tasks[1].context == [tasks[0]]
+    assert batched == tasks
+    assert batch_size == 0
+
+
+def test_batching_disabled_leaves_tasks_alone():
+    agent = StubAgent(_specs())
+    agent.batch_tasks = False
+    tasks = agent.get_tasks(CONTEXT)
+
+    assert agent.batch(tasks) == (tasks, 0)
+
+
+def test_well_formed_reply_is_split_per_task():
+    agent = StubAgent(_specs())
+
+    outputs = agent.collect_outputs(_batched_reply("A[1]: unit, e2e\nA[2]: def test(): ..."), 2)
+
+    assert outputs == ["unit, e2e", "def test(): ..."]
+
+
+@pytest.mark.parametrize("raw", [
+    "**A[1]:** unit, e2e\n\n**A[2]:** def test(): ...",
+    "**A[1]**: unit, e2e\n**A[2]**: def test(): ...",
+    "### A[1]: unit, e2e\n### A[2]: def test(): ...",
+    "`A[1]`: unit, e2e\n`A[2]`: def test(): ...",
+])
+def test_markdown_decorated_markers_are_recognized(raw):
+    agent = StubAgent(_specs())
+
+    assert agent.collect_outputs(_batched_reply(raw), 2) == ["unit, e2e", "def test(): ..."]
+
+
+@pytest.mark.parametrize("raw", [
+    "unit, e2e and a test for each",
+    "A[1]: unit, e2e",
+    "A[1]: unit, e2e\nA[2]:",
+])
+def test_reply_with_missing_answers_is_rejected(raw):
+    agent = StubAgent(_specs())
+
+    assert agent.collect_outputs(_batched_reply(raw), 2) is None
+
+
+def test_unbatched_outputs_come_from_each_task():
+    agent = StubAgent(_specs())
+    result = SimpleNamespace(tasks_output=[SimpleNamespace(raw="one"), SimpleNamespace(raw="two")])
+
+    assert agent.collect_outputs(result) == ["one", "two"]
+
+
+def test_unparseable_batched_reply_falls_back_to_unbatched_run(monkeypatch):
+    calls = []
+    real_completion = litellm.completion
+
+    def fake_completion(**params):
+        calls.append(params)
+        return real_completion(
+            **params,
+            mock_response="Thought: I now know the final answer\nFinal Answer: no markers"
+        )
+
+    monkeypatch.setattr(litellm, "completion", fake_completion)
+    agent = StubAgent(_specs())
+
+    result = agent.execute(CONTEXT)
+
+    # One batched request, then one per task
+    assert len(calls) == 3
+    assert result == {"status": "completed", "results": ["no markers", "no markers"]}
@@ -0,0 +1,163 @@
+"""
+Phase execution tests
+"""
+import threading
+import time
+from types import SimpleNamespace
+
+from agents.base import AgentRole
+from agents.crew import ProjectCrew, ProjectPhase
+
+
+class FakeAgent:
+    """Agent with fixed prompts, run by FakeCrew instead of CrewAI."""
+
+    def __init__(self, role, prompts, delay=0.0, error=None, on_kickoff=None):
+        self.config = SimpleNamespace(role=role)
+        self.prompts = prompts
+        self.delay = delay
+        self.error = error
+        self.on_kickoff = on_kickoff
+
+    def get_tasks(self, context):
+        return [
+            SimpleNamespace(description=prompt, expected_output="Text")
+            for prompt in self.prompts
+        ]
+
+    def batch(self, tasks):
+        return tasks, 0
+
+    def collect_outputs(self, result, batch_size=0):
+        return [output.raw for output in result.tasks_output]
+
+
+class FakeCrew:
+    """Crew whose kickoff answers each task with its role and prompt."""
+
+    def __init__(self, agent, tasks, log):
+        self.agent = agent
+        self.tasks = tasks
+        self.log = log
+
+    def kickoff(self):
+        self.log.start(self)
+        try:
+            time.sleep(self.agent.delay)
+            if self.agent.on_kickoff:
+                self.agent.on_kickoff()
+            if self.agent.error:
+                raise self.agent.error
+            role = self.agent.config.role.value
+            return SimpleNamespace(tasks_output=[
+                SimpleNamespace(raw=f"{role}: {task.description}") for task in self.tasks
+            ])
+        finally:
+            self.log.finish()
+
+
+class KickoffLog:
+    """Records the kickoffs made and how many ran at once."""
+
+    def __init__(self):
+        self.crews = []
+        self.running = 0
+        self.max_running = 0
+        self._lock = threading.Lock()
+
+    def start(self, crew):
+        with self._lock:
+            self.crews.append(crew)
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+
+    def finish(self):
+        with self._lock:
+            self.running -= 1
+
+
+def _project_crew(monkeypatch, agents, max_concurrency=3):
+    crew = ProjectCrew({"project_name": "Test project"}, max_concurrency=max_concurrency)
+    log = KickoffLog()
+    monkeypatch.setattr(crew, "_task_cache", None)
+    monkeypatch.setattr(crew, "_get_phase_agents", lambda phase: tuple(agents))
+    monkeypatch.setattr(
+        crew,
+        "_crew_for",
+        lambda crew_agents, tasks, verbose: FakeCrew(crew_agents[0], tasks, log)
+    )
+    return crew, log
+
+
+async def test_running_crews_are_bounded_by_max_concurrency(monkeypatch):
+    agents = [
+        FakeAgent(AgentRole.BACKEND_DEVELOPER, ["Write the API"], delay=0.05),
+        FakeAgent(AgentRole.FRONTEND_DEVELOPER, ["Write the UI"], delay=0.05),
+        FakeAgent(AgentRole.DATABASE_ENGINEER, ["Write the schema"], delay=0.05),
+    ]
+    crew, log = _project_crew(monkeypatch, agents, max_concurrency=2)
+
+    result = await crew.execute_phase(ProjectPhase.DEVELOPMENT)
+
+    assert result.status == "completed"
+    assert len(log.crews) == 3
+    assert log.max_running == 2
+
+
+async def test_task_shared_by_roles_is_run_once(monkeypatch):
+    agents = [
+        FakeAgent(AgentRole.QA_ENGINEER, ["Review the code", "Write tests"]),
+        FakeAgent(AgentRole.SECURITY_ANALYST, ["Review the code"]),
+    ]
+    crew, log = _project_crew(monkeypatch, agents)
+
+    result = await crew.execute_phase(ProjectPhase.TESTING)
+
+    assert result.status == "completed"
+    assert [task.description for c in log.crews for task in c.tasks] == [
+        "Review the code",
+        "Write tests",
+    ]
+    assert result.outputs == {
+        "qa_engineer": ["qa_engineer: Review the code", "qa_engineer: Write tests"],
+        "security_analyst": ["qa_engineer: Review the code"],
+    }
+
+
+async def test_failed_role_keeps_the_other_roles_outputs(monkeypatch):
+    agents = [
+        FakeAgent(AgentRole.QA_ENGINEER, ["Write tests"]),
+        FakeAgent(AgentRole.SECURITY_ANALYST, ["Audit"], error=RuntimeError("provider down")),
+    ]
+    crew, _ = _project_crew(monkeypatch, agents)
+
+    result = await crew.execute_phase(ProjectPhase.TESTING)
+
+    assert result.status == "failed"
+    assert result.errors == ("security_analyst: provider down",)
+    assert result.outputs == {"qa_engineer": ["qa_engineer: Write tests"]}
+    assert crew.results == [result]
+
+
+async def test_role_output_is_published_before_the_phase_ends(monkeypatch):
+    seen_while_running = []
+
+    def wait_for_architecture():
+        # Runs in this role's kickoff thread, so the event loop stays free
+        deadline = time.monotonic() + 2
+        while "Design the system" not in crew.context.architecture_json:
+            if time.monotonic() > deadline:
+                break
+            time.sleep(0.01)
+        seen_while_running.append(crew.context.architecture_json)
+
+    agents = [
+        FakeAgent(AgentRole.ARCHITECT, ["Design the system"]),
+        FakeAgent(AgentRole.DATABASE_ENGINEER, ["Design the schema"], on_kickoff=wait_for_architecture),
+    ]
+    crew, _ = _project_crew(monkeypatch, agents)
+
+    result = await crew.execute_phase(ProjectPhase.ARCHITECTURE)
+
+    assert result.status == "completed"
+    assert "Design the system" in seen_while_running[0]
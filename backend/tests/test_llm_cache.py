@@ -0,0 +1,130 @@
+"""
+LLM response cache tests
+"""
+import litellm
+import pytest
+from crewai import Agent, Crew, Task
+
+from agents.llm_cache import CachingLLM, cache_project
+
+FINAL_ANSWER = "Thought: I now know the final answer\nFinal Answer: cached answer"
+
+
+class FakeRedis:
+    """In-memory stand-in for the few Redis commands the exact tier uses."""
+
+    def __init__(self):
+        self.store = {}
+
+    def get(self, key):
+        return self.store.get(key)
+
+    def setex(self, key, ttl, value):
+        self.store[key] = value
+
+
+@pytest.fixture
+def completions(monkeypatch):
+    """Record litellm completions and answer them without network access."""
+    calls = []
+    real_completion = litellm.completion
+
+    def fake_completion(**params):
+        calls.append(params)
+        return real_completion(**params, mock_response=FINAL_ANSWER)
+
+    monkeypatch.setattr(litellm, "completion", fake_completion)
+    return calls
+
+
+def _kickoff(agent: Agent):
+    task = Task(
+        description="Greet the team.",
+        expected_output="A one-line greeting",
+        agent=agent
+    )
+    return Crew(agents=[agent], tasks=[task]).kickoff()
+
+
+def _greeter(llm) -> Agent:
+    return Agent(
+        role="Greeter",
+        goal="Greet people",
+        backstory="A friendly test agent",
+        llm=llm,
+        allow_delegation=False
+    )
+
+
+def test_repeated_agent_run_is_served_from_cache(completions):
+    redis_client = FakeRedis()
+    llm = CachingLLM(
+        model="openai/gpt-4o-mini",
+        temperature=0.0,
+        api_key="test-key",
+        semantic=False,
+        client=redis_client
+    )
+    agent = _greeter(llm)
+
+    # CrewAI must keep our LLM rather than rebuilding it
+    assert agent.llm is llm
+
+    first = _kickoff(agent)
+    second = _kickoff(agent)
+
+    assert len(completions) == 1
+    assert len(redis_client.store) == 1
+    assert first.raw == second.raw == "cached answer"
+
+
+def test_sampled_calls_are_not_cached(completions):
+    redis_client = FakeRedis()
+    llm = CachingLLM(
+        model="openai/gpt-4o-mini",
+        temperature=0.7,
+        api_key="test-key",
+        semantic=False,
+        client=redis_client
+    )
+    agent = _greeter(llm)
+
+    _kickoff(agent)
+    _kickoff(agent)
+
+    assert len(completions) == 2
+    assert redis_client.store == {}
+
+
+def test_semantic_search_is_scoped_to_the_project():
+    llm = CachingLLM(model="openai/gpt-4o-mini", temperature=0.0, api_key="k", client=FakeRedis())
+
+    first = llm._search_args(b"vec", "project-1")[2]
+    second = llm._search_args(b"vec", "project-2")[2]
+
+    assert first.startswith("(@project:{") and first != second
+
+
+def test_semantic_tier_is_skipped_outside_a_project(monkeypatch, completions):
+    llm = CachingLLM(
+        model="openai/gpt-4o-mini",
+        temperature=0.0,
+        api_key="test-key",
+        semantic=True,
+        client=FakeRedis()
+    )
+    monkeypatch.setattr(llm, "_get_semantic", lambda *args: pytest.fail("semantic lookup"))
+    monkeypatch.setattr(llm, "_embed", lambda text: pytest.fail("embedding"))
+
+    assert cache_project.get() is None
+    _kickoff(_greeter(llm))
+
+    assert len(completions) == 1
+
+
+def test_cache_key_depends_on_temperature():
+    messages = [{"role": "user", "content": "hello"}]
+    warm = CachingLLM(model="openai/gpt-4o-mini", temperature=0.7, api_key="k", client=FakeRedis())
+    cold = CachingLLM(model="openai/gpt-4o-mini", temperature=0.0, api_key="k", client=FakeRedis())
+
+    assert warm._cache_key(messages) != cold._cache_key(messages)
@@ -0,0 +1,62 @@
+"""
+Keyset pagination helper tests
+"""
+from datetime import datetime
+from types import SimpleNamespace
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+from fastapi import HTTPException, Request
+
+from api.pagination import next_page_link, require_complete_cursor
+
+CURSOR = ("after_created_at", "after_id")
+
+
+def _request(query: bytes = b"limit=2") -> Request:
+    return Request({
+        "type": "http",
+        "scheme": "http",
+        "server": ("test", 80),
+        "path": "/api/projects/",
+        "query_string": query,
+        "headers": [],
+    })
+
+
+def _row(page_size: int):
+    return SimpleNamespace(_mapping={
+        "page_size": page_size,
+        "next_after_created_at": datetime(2024, 1, 2, 3, 4, 5),
+        "next_after_id": 7,
+    })
+
+
+def test_partial_cursor_is_rejected():
+    with pytest.raises(HTTPException) as excinfo:
+        require_complete_cursor(after_created_at=None, after_id=7)
+
+    assert excinfo.value.status_code == 422
+
+
+def test_complete_or_absent_cursor_is_accepted():
+    require_complete_cursor(after_created_at=None, after_id=None)
+    require_complete_cursor(after_created_at=datetime(2024, 1, 1), after_id=7)
+
+
+def test_full_page_links_to_the_next_page():
+    headers = next_page_link(_request(), CURSOR, 2)([_row(2)])
+
+    url, rel = headers["Link"].split("; ")
+    query = parse_qs(urlsplit(url.strip("<>")).query)
+    assert rel == 'rel="next"'
+    assert query == {
+        "limit": ["2"],
+        "after_created_at": ["2024-01-02T03:04:05"],
+        "after_id": ["7"],
+    }
+
+
+def test_last_page_has_no_link():
+    assert next_page_link(_request(), CURSOR, 2)([_row(1)]) == {}
+    assert next_page_link(_request(), CURSOR, 2)([]) == {}
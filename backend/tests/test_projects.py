@@ -0,0 +1,76 @@
+"""
+Project API tests
+
+These use the session and client fixtures, which need TEST_DATABASE_URL.
+"""
+from datetime import datetime
+
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import func, select
+
+from api import streaming
+from api.projects import ProjectResponse, delete_project
+from database.models import Message, Project, Task
+
+
+async def test_delete_project_removes_tasks_and_messages(session):
+    project = Project(name="Doomed project")
+    session.add(project)
+    await session.flush()
+    session.add_all([
+        Task(title="Design schema", project_id=project.id),
+        Message(from_agent="architect", content="Schema ready", project_id=project.id),
+    ])
+    await session.commit()
+
+    await delete_project(project.id, session)
+
+    for model in (Project, Task, Message):
+        count = await session.scalar(select(func.count()).select_from(model))
+        assert count == 0, model.__tablename__
+
+
+async def test_streamed_list_matches_a_plain_list_response(session, client, monkeypatch):
+    # Several batches, so the spliced array boundaries are exercised too
+    monkeypatch.setattr(streaming, "STREAM_BATCH_SIZE", 2)
+    session.add_all([Project(name=f"Project {i}", requirements={"i": i}) for i in range(5)])
+    await session.commit()
+
+    response = await client.get("/api/projects/")
+
+    result = await session.execute(
+        select(Project).order_by(Project.created_at.desc(), Project.id.desc())
+    )
+    expected = jsonable_encoder(
+        [ProjectResponse.model_validate(project) for project in result.scalars()]
+    )
+    assert response.status_code == 200
+    assert response.json() == expected
+
+
+async def test_pages_follow_the_next_link_in_keyset_order(session, client):
+    # Pairs of projects share a created_at, so the id tiebreak is exercised
+    session.add_all([
+        Project(name=f"Project {i}", created_at=datetime(2024, 1, 1 + i // 2))
+        for i in range(7)
+    ])
+    await session.commit()
+
+    seen = []
+    url = "/api/projects/?limit=3"
+    while url:
+        response = await client.get(url)
+        assert response.status_code == 200
+        seen.extend(project["id"] for project in response.json())
+        url = response.links.get("next", {}).get("url")
+
+    result = await session.execute(
+        select(Project.id).order_by(Project.created_at.desc(), Project.id.desc())
+    )
+    assert seen == list(result.scalars())
+
+
+async def test_partial_cursor_is_rejected(client):
+    response = await client.get("/api/projects/?after_id=1")
+
+    assert response.status_code == 422
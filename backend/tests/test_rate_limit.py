@@ -0,0 +1,103 @@
+"""
+Rate limiting tests
+"""
+import pytest
+
+from agents import rate_limit
+from agents.rate_limit import TokenBucket
+
+
+class FakeClock:
+    """Monotonic clock that only moves when sleep() is called."""
+
+    def __init__(self):
+        self.now = 1000.0
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+    async def async_sleep(self, seconds):
+        self.sleep(seconds)
+
+    def bucket(self, rate_per_sec, burst):
+        """Build a bucket that keeps time and sleeps on this clock."""
+        return TokenBucket(
+            rate_per_sec=rate_per_sec,
+            burst=burst,
+            clock=self.monotonic,
+            sleep=self.sleep,
+            async_sleep=self.async_sleep
+        )
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+def test_burst_is_served_without_waiting(clock):
+    bucket = clock.bucket(rate_per_sec=1, burst=3)
+
+    for _ in range(3):
+        bucket.acquire_sync()
+
+    assert clock.sleeps == []
+
+
+def test_waits_for_refill_once_empty(clock):
+    bucket = clock.bucket(rate_per_sec=2, burst=2)
+    bucket.acquire_sync(2)
+
+    bucket.acquire_sync()
+
+    assert clock.sleeps == [pytest.approx(0.5)]
+
+
+def test_tokens_refill_over_time(clock):
+    bucket = clock.bucket(rate_per_sec=1, burst=5)
+    bucket.acquire_sync(5)
+
+    clock.now += 3
+    bucket.acquire_sync(3)
+
+    assert clock.sleeps == []
+
+
+def test_refill_is_capped_at_capacity(clock):
+    bucket = clock.bucket(rate_per_sec=1, burst=2)
+
+    clock.now += 60
+    bucket.acquire_sync(2)
+    bucket.acquire_sync()
+
+    assert clock.sleeps == [pytest.approx(1.0)]
+
+
+def test_oversized_request_is_capped_at_capacity(clock):
+    bucket = clock.bucket(rate_per_sec=10, burst=10)
+
+    bucket.acquire_sync(1000)
+
+    assert clock.sleeps == []
+
+
+async def test_async_acquire_waits_without_blocking(clock):
+    bucket = clock.bucket(rate_per_sec=4, burst=1)
+    await bucket.acquire()
+
+    await bucket.acquire()
+
+    assert clock.sleeps == [pytest.approx(0.25)]
+
+
+def test_estimate_tokens_scales_with_prompt_size():
+    short = rate_limit._estimate_tokens("x" * 40)
+    long = rate_limit._estimate_tokens([{"role": "user", "content": "x" * 4000}])
+
+    assert short == 10
+    assert long > 1000
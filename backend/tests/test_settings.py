@@ -0,0 +1,41 @@
+"""
+Settings API tests
+
+These use the session and client fixtures, which need TEST_DATABASE_URL.
+"""
+
+
+async def _create_key(client, provider: str) -> None:
+    response = await client.post(
+        "/api/settings/api-keys",
+        json={"provider": provider, "api_key": f"sk-{provider}-0123456789"}
+    )
+    assert response.status_code == 201
+
+
+async def test_mark_used_marks_every_known_provider(client):
+    await _create_key(client, "openai")
+    await _create_key(client, "anthropic")
+    await _create_key(client, "openrouter")
+
+    response = await client.post(
+        "/api/settings/api-keys/mark-used",
+        json=["openai", "anthropic", "unknown"]
+    )
+
+    assert response.status_code == 200
+    assert sorted(response.json()["marked"]) == ["anthropic", "openai"]
+
+    keys = {key["provider"]: key for key in (await client.get("/api/settings/api-keys")).json()}
+    assert keys["openai"]["last_used"] is not None
+    assert keys["anthropic"]["last_used"] is not None
+    assert keys["openrouter"]["last_used"] is None
+
+
+async def test_mark_used_with_only_unknown_providers_marks_nothing(client):
+    await _create_key(client, "openai")
+
+    response = await client.post("/api/settings/api-keys/mark-used", json=["unknown"])
+
+    assert response.status_code == 200
+    assert response.json() == {"marked": []}
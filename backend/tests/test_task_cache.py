@@ -0,0 +1,46 @@
+"""
+Task result cache tests
+"""
+from concurrent.futures import ThreadPoolExecutor
+
+from agents.task_cache import TaskCache
+
+
+def test_only_requested_outputs_are_returned(tmp_path):
+    cache = TaskCache(str(tmp_path / "tasks.db"))
+    cache.put_outputs({"a": "first", "b": "second"})
+
+    assert cache.get_outputs(["a", "missing"]) == {"a": "first"}
+
+
+def test_outputs_are_shared_between_instances(tmp_path):
+    path = str(tmp_path / "tasks.db")
+    TaskCache(path).put_outputs({"a": "first"})
+    TaskCache(path).put_outputs({"a": "replaced"})
+
+    assert TaskCache(path).get_outputs(["a"]) == {"a": "replaced"}
+
+
+def test_concurrent_writers_do_not_lose_outputs(tmp_path):
+    path = str(tmp_path / "tasks.db")
+
+    def write(index):
+        # One cache per writer, as separate processes would have
+        TaskCache(path).put_outputs({f"key-{index}": f"output-{index}"})
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(write, range(32)))
+
+    stored = TaskCache(path).get_outputs(f"key-{index}" for index in range(32))
+    assert len(stored) == 32
+
+
+def test_batches_are_kept_per_project(tmp_path):
+    cache = TaskCache(str(tmp_path / "tasks.db"))
+    cache.set_batch("1", "testing", {"batch_id": "b-1", "provider": "openai"})
+    cache.set_batch("2", "testing", {"batch_id": "b-2", "provider": "openai"})
+
+    cache.set_batch("2", "testing", None)
+
+    assert cache.get_batches("1") == {"testing": {"batch_id": "b-1", "provider": "openai"}}
+    assert cache.get_batches("2") == {}
@@ -1,7 +1,10 @@
 """
 Logging Configuration
 """
+import logging
 import sys
+import orjson
+import structlog
 from loguru import logger
 from core.config import settings
 
@@ -25,3 +28,19 @@ logger.add(
     retention="30 days",
     compression="zip",
 )
+
+# Structured logging for agents, rendered straight to bytes with orjson
+structlog.configure(
+    processors=[
+        structlog.contextvars.merge_contextvars,
+        structlog.processors.add_log_level,
+        structlog.processors.TimeStamper(fmt="iso"),
+        structlog.processors.JSONRenderer(serializer=orjson.dumps),
+    ],
+    wrapper_class=structlog.make_filtering_bound_logger(
+        logging.getLevelName(settings.LOG_LEVEL)
+    ),
+    logger_factory=structlog.BytesLoggerFactory(),
+    cache_logger_on_first_use=True,
+)
+